@@ -0,0 +1,337 @@
+'''
+bitboard position for the checkers engine
+the 32 dark squares are numbered row by row (square = row*4 + column//2) and
+black pieces, white pieces and kings are each kept as a 32-bit mask over them
+'''
+
+import json
+import random
+
+######################## SQUARES ########################
+
+FULL = 0xFFFFFFFF # all 32 dark squares
+EDGES = 0x18181818 # squares on column 0 or column 7
+ROWS = [0xF << (4*m) for m in range(8)] # mask of every row
+BLACK_KING_ROW = ROWS[7] # black pieces become kings here
+WHITE_KING_ROW = ROWS[0] # white pieces become kings here
+
+COORDS = [] # (row, column) on the 8x8 board for every square
+SQUARE = {} # square for every dark (row, column) on the 8x8 board
+for sq in range(32):
+	m = sq // 4
+	n = 2*(sq % 4) + (1 if m % 2 == 0 else 0)
+	COORDS.append((m, n))
+	SQUARE[(m, n)] = sq
+
+JUMPED = {} # square that is jumped over for every (source, destination) jump
+for sq in range(32):
+	m, n = COORDS[sq]
+	for dm, dn in ((1, 1), (-1, 1), (1, -1), (-1, -1)):
+		if (m+2*dm, n+2*dn) in SQUARE:
+			JUMPED[(sq, SQUARE[(m+2*dm, n+2*dn)])] = SQUARE[(m+dm, n+dn)]
+
+######################## ZOBRIST KEYS ########################
+
+# fixed seed so every process (and every run) hashes positions the same way
+seeded = random.Random(1127)
+ZOBRIST = [[seeded.getrandbits(64) for sq in range(32)] for piece in range(4)] # black man, white man, black king, white king
+BLACK_TO_MOVE = seeded.getrandbits(64) # xor-ed into the key of a position when black is to move
+
+# will return the zobrist key of the pieces on the board
+def zobrist(black, white, kings):
+	key = 0
+	for sq in range(32):
+		bit = 1 << sq
+		if black & bit: key ^= ZOBRIST[2 if kings & bit else 0][sq]
+		elif white & bit: key ^= ZOBRIST[3 if kings & bit else 1][sq]
+	return key
+
+######################## EVALUATION ########################
+
+PIECE_NAMES = ('black man', 'white man', 'black king', 'white king') # pieces in the order of the tables (and of a weights file)
+# value of every piece on every square for its owner: material (100 a man, 175 a king), a bonus
+# for men going to the opposing side and a penalty for kings on an edge (they could become trapped)
+PIECE_SQUARE = [
+	[100 + COORDS[sq][0]**2 for sq in range(32)],
+	[100 + (7-COORDS[sq][0])**2 for sq in range(32)],
+	[175 - (25 if EDGES & (1 << sq) else 0) for sq in range(32)],
+	[175 - (25 if EDGES & (1 << sq) else 0) for sq in range(32)]]
+SCORE = [] # the same tables signed for black (white pieces count negative), summed up in position.score
+
+# will replace the piece-square tables (four lists of 32 values in the order of PIECE_NAMES),
+# positions made before keep their old scores until count() is called on them
+def set_weights(tables):
+	if len(tables) != 4 or any(len(table) != 32 for table in tables):
+		raise ValueError('expected 4 tables of 32 squares')
+	PIECE_SQUARE[:] = [[int(value) for value in table] for table in tables]
+	SCORE[:] = [PIECE_SQUARE[0], [-value for value in PIECE_SQUARE[1]], PIECE_SQUARE[2], [-value for value in PIECE_SQUARE[3]]]
+
+# will load the piece-square tables from a json file {"black man": [32 values], "white man": ..., ...},
+# pieces missing from the file keep their table
+def load_weights(filename):
+	with open(filename) as f:
+		weights = json.load(f)
+	set_weights([weights.get(PIECE_NAMES[piece], PIECE_SQUARE[piece]) for piece in range(4)])
+
+# will save the piece-square tables in the format read by load_weights
+def save_weights(filename):
+	with open(filename, 'w') as f:
+		json.dump(dict(zip(PIECE_NAMES, PIECE_SQUARE)), f, indent=1)
+
+set_weights(PIECE_SQUARE)
+
+# will return the evaluation for black of the pieces on the board
+def piece_square_score(black, white, kings):
+	score = 0
+	for sq in range(32):
+		bit = 1 << sq
+		if black & bit: score += SCORE[2 if kings & bit else 0][sq]
+		elif white & bit: score += SCORE[3 if kings & bit else 1][sq]
+	return score
+
+######################## MOVE TABLES ########################
+
+DIRECTIONS = ((1, 1), (-1, 1), (1, -1), (-1, -1)) # (row, column) steps in the order moves are listed
+BLACK_MAN, WHITE_MAN, KING = 0, 1, 2 # kinds of pieces that move differently
+KIND_DIRECTIONS = ((0, 2), (1, 3), (0, 1, 2, 3)) # black men move down, white men up, kings both ways
+
+# STEPS[kind][square] = (neighbor bit, neighbor, can jump, landing bit, landing) for every direction the
+# piece may go, where can jump is False (and landing is -1) if the jump would leave the board
+STEPS = [[], [], []]
+for kind in range(3):
+	for sq in range(32):
+		m, n = COORDS[sq]
+		steps = []
+		for d in KIND_DIRECTIONS[kind]:
+			dm, dn = DIRECTIONS[d]
+			if (m+dm, n+dn) not in SQUARE: continue
+			neighbor = SQUARE[(m+dm, n+dn)]
+			if (m+2*dm, n+2*dn) in SQUARE:
+				landing = SQUARE[(m+2*dm, n+2*dn)]
+				steps.append((1 << neighbor, neighbor, True, 1 << landing, landing))
+			else: steps.append((1 << neighbor, neighbor, False, 0, -1))
+		STEPS[kind].append(tuple(steps))
+
+######################## CLASSES ########################
+
+# class representing a position (black, white and king masks plus piece counts, zobrist key and evaluation for black)
+class Position(object):
+	__slots__ = ('black', 'white', 'kings', 'black_count', 'white_count', 'black_kings', 'white_kings', 'key', 'score')
+
+	def __init__(self, black=0, white=0, kings=0):
+		self.black = black
+		self.white = white
+		self.kings = kings
+		self.count()
+
+	# count, hash and evaluate the pieces from the masks (make_move and unmake_move keep them up to date after this)
+	def count(self):
+		self.black_count = self.black.bit_count()
+		self.white_count = self.white.bit_count()
+		self.black_kings = (self.black & self.kings).bit_count()
+		self.white_kings = (self.white & self.kings).bit_count()
+		self.key = zobrist(self.black, self.white, self.kings)
+		self.score = piece_square_score(self.black, self.white, self.kings)
+
+	def copy(self):
+		position = Position.__new__(Position)
+		position.black, position.white, position.kings = self.black, self.white, self.kings
+		position.black_count, position.white_count = self.black_count, self.white_count
+		position.black_kings, position.white_kings = self.black_kings, self.white_kings
+		position.key, position.score = self.key, self.score
+		return position
+
+	def __eq__(self, other):
+		return self.black == other.black and self.white == other.white and self.kings == other.kings
+
+######################## FUNCTIONS ########################
+
+# will return every piece on the board as (row, column, color, king)
+def pieces(position):
+	result = []
+	for sq in range(32):
+		bit = 1 << sq
+		if position.black & bit: result.append(COORDS[sq] + ('black', position.kings & bit != 0))
+		elif position.white & bit: result.append(COORDS[sq] + ('white', position.kings & bit != 0))
+	return result
+
+# move given as squares -> move given as ((row, column), (row, column))
+def to_coordinates(move):
+	return COORDS[move[0]], COORDS[move[1]]
+
+# move given as ((row, column), (row, column)) -> move given as squares
+def from_coordinates(a, b):
+	return SQUARE[tuple(a)], SQUARE[tuple(b)]
+
+# will return list with available moves (source, destination) to the player
+def avail_moves(position, player):
+	if player == 'black': own, opp, men = position.black, position.white, STEPS[BLACK_MAN]
+	else: own, opp, men = position.white, position.black, STEPS[WHITE_MAN]
+	kings, all_kings = STEPS[KING], position.kings
+	empty = FULL & ~(own | opp)
+	jumps, moves = [], []
+
+	# one pass over our pieces, in square order, collects both (jumps are mandatory)
+	pieces = own
+	while pieces:
+		bit = pieces & -pieces
+		pieces ^= bit
+		sq = bit.bit_length()-1
+		for neighbor_bit, neighbor, can_jump, landing_bit, landing in (kings if all_kings & bit else men)[sq]:
+			if empty & neighbor_bit: moves.append((sq, neighbor))
+			elif can_jump and opp & neighbor_bit and empty & landing_bit: jumps.append((sq, landing))
+
+	if len(jumps) > 0: return jumps
+	return moves
+
+# make a move on a position, assuming it's legit
+# returns the undo record (source, destination, captured square or -1, captured king, crowned, old key, old score) for unmake_move
+def make_move(position, move):
+	src, dst = move
+	a, b = 1 << src, 1 << dst
+	key, score = position.key, position.score
+	black = position.black & a != 0
+	if black: position.black ^= a | b
+	else: position.white ^= a | b
+	piece = 0 if black else 1 # zobrist piece index
+
+	crowned = False
+	if position.kings & a: # move the king
+		position.kings ^= a | b
+		piece += 2
+		position.key ^= ZOBRIST[piece][src] ^ ZOBRIST[piece][dst]
+		position.score += SCORE[piece][dst] - SCORE[piece][src]
+	elif b & (BLACK_KING_ROW if black else WHITE_KING_ROW): # we made a king
+		position.kings |= b
+		crowned = True
+		if black: position.black_kings += 1
+		else: position.white_kings += 1
+		position.key ^= ZOBRIST[piece][src] ^ ZOBRIST[piece+2][dst]
+		position.score += SCORE[piece+2][dst] - SCORE[piece][src]
+	else:
+		position.key ^= ZOBRIST[piece][src] ^ ZOBRIST[piece][dst]
+		position.score += SCORE[piece][dst] - SCORE[piece][src]
+
+	captured, captured_king = JUMPED.get(move, -1), False
+	if captured >= 0: # we made a jump...
+		c = 1 << captured
+		captured_king = position.kings & c != 0
+		if captured_king: position.kings ^= c
+		if black: # delete the jumped piece
+			position.white ^= c
+			position.white_count -= 1
+			if captured_king: position.white_kings -= 1
+		else:
+			position.black ^= c
+			position.black_count -= 1
+			if captured_king: position.black_kings -= 1
+		position.key ^= ZOBRIST[(2 if captured_king else 0) + (1 if black else 0)][captured]
+		position.score -= SCORE[(2 if captured_king else 0) + (1 if black else 0)][captured]
+
+	return src, dst, captured, captured_king, crowned, key, score
+
+# take back a move made by make_move
+def unmake_move(position, undo):
+	src, dst, captured, captured_king, crowned, key, score = undo
+	a, b = 1 << src, 1 << dst
+	black = position.black & b != 0
+	if black: position.black ^= a | b
+	else: position.white ^= a | b
+	position.key, position.score = key, score
+
+	if crowned: # the piece was not a king before the move
+		position.kings ^= b
+		if black: position.black_kings -= 1
+		else: position.white_kings -= 1
+	elif position.kings & b: position.kings ^= a | b
+
+	if captured >= 0: # put the jumped piece back
+		c = 1 << captured
+		if captured_king: position.kings |= c
+		if black:
+			position.white |= c
+			position.white_count += 1
+			if captured_king: position.white_kings += 1
+		else:
+			position.black |= c
+			position.black_count += 1
+			if captured_king: position.black_kings += 1
+
+# will count the positions depth plies after position (perft), for checking and timing the move generator
+def perft(position, player, depth):
+	if depth == 0: return 1
+	moves = avail_moves(position, player)
+	if depth == 1: return len(moves)
+	if player == 'black': opponent = 'white'
+	else: opponent = 'black'
+	total = 0
+	for move in moves:
+		undo = make_move(position, move)
+		total += perft(position, opponent, depth-1)
+		unmake_move(position, undo)
+	return total
+
+# key of the position with the player to move folded in (used by the transposition table)
+def hash_key(position, player):
+	if player == 'black': return position.key ^ BLACK_TO_MOVE
+	return position.key
+
+# will evaluate position for a player (the piece-square tables summed up by make_move)
+def evaluate(position, player):
+	if player != 'black': return -position.score
+	else: return position.score
+
+# have we killed the opponent already?
+def end_game(position):
+	return position.black_count, position.white_count
+
+######################## NOTATION ########################
+
+''' positions are written like the FEN of PDN files: the player to move, then the squares of the white and of the
+    black pieces, a K before the square of a king, e.g. W:W21,22,K30:B1,2,K5 (squares are numbered 1-32, square + 1,
+    so black starts on 1-12 and white on 21-32) '''
+
+# will return the text of position with player to move
+def to_fen(position, player):
+	fields = [('W' if player == 'white' else 'B')]
+	for color, mask in (('W', position.white), ('B', position.black)):
+		squares = []
+		for sq in range(32):
+			if mask & (1 << sq): squares.append(('K' if position.kings & (1 << sq) else '') + str(sq + 1))
+		fields.append(color + ','.join(squares))
+	return ':'.join(fields)
+
+# will return (position, player to move) for the text made by to_fen (squares may also be given as ranges, 1-12),
+# raises ValueError if it is not a position
+def from_fen(text):
+	fields = text.strip().split(':')
+	if len(fields) != 3 or fields[0].upper() not in ('W', 'B'): raise ValueError('bad position: ' + text.strip())
+	masks = {'W': 0, 'B': 0}
+	kings = 0
+	for field in fields[1:]:
+		color = field[:1].upper()
+		if color not in masks or masks[color] != 0: raise ValueError('bad position: ' + text.strip())
+		for square in field[1:].split(','):
+			square = square.strip().upper()
+			if square == '': continue
+			king = square.startswith('K')
+			if king: square = square[1:]
+			try:
+				if '-' in square: first, last = [int(s) for s in square.split('-')]
+				else: first = last = int(square)
+			except ValueError:
+				raise ValueError('bad square ' + square + ' in position: ' + text.strip())
+			for number in range(first, last+1):
+				if number < 1 or number > 32 or (masks['W'] | masks['B']) & (1 << (number - 1)):
+					raise ValueError('bad square ' + str(number) + ' in position: ' + text.strip())
+				bit = 1 << (number - 1)
+				if not king and bit & (BLACK_KING_ROW if color == 'B' else WHITE_KING_ROW): # a man there would have been crowned
+					raise ValueError('bad square ' + str(number) + ' in position: ' + text.strip())
+				masks[color] |= bit
+				if king: kings |= bit
+	return Position(masks['B'], masks['W'], kings), ('white' if fields[0].upper() == 'W' else 'black')
+
+# will return the text of a move given as squares, 9-13 for a step and 9x18 for a jump
+def move_text(move):
+	if move in JUMPED: return '%dx%d' % (move[0] + 1, move[1] + 1)
+	return '%d-%d' % (move[0] + 1, move[1] + 1)
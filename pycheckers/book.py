@@ -0,0 +1,62 @@
+'''
+opening book: best moves for the positions of the first plies of a game, searched deeply offline
+the file is a header and a sorted array of fixed-size records, it is memory-mapped so processes
+that open the same book share one copy in memory
+'''
+
+import mmap
+import struct
+
+######################## VARIABLES ########################
+
+MAGIC = b'PCB1' # first bytes of a book file
+HEADER = struct.Struct('<4sI') # magic, number of records
+RECORD = struct.Struct('<QBBh') # position key (see bitboard.hash_key), source, destination, score
+KEY = struct.Struct('<Q') # just the key of a record
+
+######################## CLASSES ########################
+
+# class representing an opening book file opened for reading
+class OpeningBook(object):
+	def __init__(self, filename):
+		self.filename = filename
+		self.file = open(filename, 'rb')
+		self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		if len(self.data) < HEADER.size: raise ValueError(filename + ' is not an opening book')
+		magic, self.size = HEADER.unpack_from(self.data, 0)
+		if magic != MAGIC: raise ValueError(filename + ' is not an opening book')
+		if HEADER.size + self.size*RECORD.size > len(self.data): raise ValueError(filename + ' is cut short')
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return self.size
+
+	# will return (move as (source, destination), score for the player to move) for key or None (binary search)
+	def probe(self, key):
+		low, high = 0, self.size
+		while low < high:
+			middle = (low + high) // 2
+			found = KEY.unpack_from(self.data, HEADER.size + middle*RECORD.size)[0]
+			if found < key: low = middle + 1
+			elif found > key: high = middle
+			else:
+				key, source, destination, score = RECORD.unpack_from(self.data, HEADER.size + middle*RECORD.size)
+				self.hits += 1
+				return (source, destination), score
+		self.misses += 1
+		return None
+
+	def close(self):
+		self.data.close()
+		self.file.close()
+
+######################## FUNCTIONS ########################
+
+# will write an opening book, entries = {key: ((source, destination), score)}
+def write_book(filename, entries):
+	with open(filename, 'wb') as f:
+		f.write(HEADER.pack(MAGIC, len(entries)))
+		for key in sorted(entries):
+			move, score = entries[key]
+			f.write(RECORD.pack(key, move[0], move[1], max(-32768, min(32767, score))))
@@ -0,0 +1,1925 @@
+'''
+checkers engine: the board, the players, the search strategies (minimax, negascout, negamax, minimax w/ab
+cutoff) and the genetic algorithm, the headless experiment, the opening book and the benchmark
+it does not import pygame, the window is in Checkers.py
+'''
+
+import random # http://effbot.org/pyfaq/how-do-i-generate-random-numbers-in-python.htm
+import time 
+import platform
+import multiprocessing
+import threading
+import os
+import subprocess
+import sys
+
+# engine imports
+from bitboard import Position, SQUARE, pieces, to_coordinates, from_coordinates, avail_moves, make_move, unmake_move, evaluate, end_game, hash_key, load_weights, set_weights, PIECE_SQUARE, perft, from_fen, to_fen, move_text
+from transposition import TranspositionTable, EXACT, LOWER, UPPER, FLIP
+from book import OpeningBook, write_book
+from tablebase import Tablebase, build_tablebase
+from results import ResultsRecorder
+
+######################## VARIABLES ########################
+
+turn = 'white' # keep track of whose turn it is
+board = 0 # link to our 'main' board
+move_limit = [150, 0] # move limit for each game (declares game as draw otherwise)
+
+# artificial intelligence related
+best_move = () # best move for the player as determined by strategy
+black, white = (), () # black and white players
+search_depth = 1 # ply depth of the search that is running
+move_time = None # seconds per move for the computer players (None = always search to the full ply depth)
+game_clock = None # seconds per game for each computer player (None = no clock)
+search_processes = 1 # worker processes for every move of the computer players (1 = search in this process)
+search_pool = None # worker processes of the parallel search and the genetic algorithm (started when first needed)
+search_pool_size = 0 # number of processes in search_pool
+search_pool_settings = None # worker_settings the processes of search_pool were started with
+shared_alpha = None # best root score found so far, shared by the workers of the parallel search
+search_cancel = None # searches of the pool numbered below its value (a multiprocessing.Value) stop at their next node
+search_count = 0 # number of searches started on the pool
+genetic_config = None # GeneticConfig of the genetic players (None = the defaults)
+generations = 0 # generations the genetic algorithm ran for the last move
+max_ply = 20 # deepest iteration of a timed search
+deadline = None # time.time() at which a timed search has to stop
+search_stopped = False # the running search was stopped from another thread (see stop_search)
+ponder = False # the computer players search the expected reply of their opponent while the opponent thinks
+reply_depth = 4 # plies searched to find the expected reply of the opponent
+ponder_pool = None # worker process that ponders (started once and reused, see ponder_process)
+ponder_cancel = None # ponders numbered below its value (a multiprocessing.Value) stop at their next node
+ponder_count = 0 # number of ponders started
+ponders = {} # (key of the position after the expected reply, number, AsyncResult) of the ponder of each player
+nodes = 0 # number of nodes searched so far
+evaluations = 0 # number of leaves scored with the evaluation so far
+cutoffs = 0 # number of beta cut-offs so far
+copies = 0 # number of boards copied by the searches so far
+chromosomes_evaluated = 0 # number of chromosomes scored by the genetic algorithm so far
+tree_size = 0 # nodes of the reservation tree at the end of the last genetic search
+survivors = [] # chromosomes of the last genetic search, the ones left at the end first and then the ones dropped (latest first)...
+genetic_lines = {} # ...kept for the next search of each player with the number of moves played then (see keptChromosomes)
+kept_chromosomes = 0 # chromosomes the last genetic search took from the one before
+search_stats = None # SearchStats of the last move of a computer player (see think)
+show_latency = False # print the p50/p95/p99 seconds per move of every strategy with the statistics
+show_stats = False # print the SearchStats of every move
+move_ordering = True # killer and history move ordering (False: only the transposition table move goes first)
+killers = {} # two moves per ply that caused a cut-off last (kept for all depths of one search)
+history = {'black': [0]*1024, 'white': [0]*1024} # cut-off score of every move (source*32 + destination)
+table_size = 2**18 # number of entries the transposition table starts with (transposition.resize changes it)
+opening_book = None # OpeningBook the computer players take the moves of book positions from (None = no book)
+book_plies = 4 # the book has the positions of this many plies from the start...
+book_depth = 10 # ...searched this deep
+endgame_tablebase = None # Tablebase the searches take the exact scores of positions with few pieces from (None = no tablebase)
+transposition = TranspositionTable(table_size) # shared by alpha-beta, negamax and negascout (see transposition.hits, .misses)
+
+# experiment variables 
+move_times = {'black': [], 'white': []} # seconds of every move of each player in this game...
+game_generations = 0 # ...and the generations the genetic player needed for its moves
+results_recorder = None # ResultsRecorder every game is written to (None = the games are not written)
+
+######################## CLASSES ########################
+
+# class representing piece on the board
+class Piece(object):
+	def __init__(self, color, king):
+		self.color = color
+		self.king = king
+
+# class representing player
+class Player(object):
+	def __init__(self, type, color, strategy, ply_depth, move_time=None, clock=None, processes=1, genetic=None):
+		self.type = type # cpu or genetic
+		self.color = color # black or white
+		self.strategy = strategy # choice of strategy: minimax, negascout, negamax, minimax w/ab
+		self.ply_depth = ply_depth # ply depth for algorithms
+		self.move_time = move_time # seconds per move (iterative deepening instead of ply_depth)
+		self.clock = clock # seconds for the whole game (iterative deepening instead of ply_depth)
+		self.time_left = clock # what is left of the clock in this game
+		self.processes = processes # worker processes that split the root moves between them
+		if genetic == None: genetic = GeneticConfig()
+		self.genetic = genetic # settings of the genetic algorithm
+
+# class representing the settings of the genetic algorithm
+class GeneticConfig(object):
+	def __init__(self, population=4, generations=None, mutation_rate=0.5, crossover=True, selection='truncation',
+		eliminate=1, tournament_size=2, elite=1, stable_generations=None, keep_tree=True, verbose=False):
+		if selection not in ('truncation', 'tournament', 'elitism'):
+			raise ValueError('unknown selection: ' + str(selection))
+		self.population = population # chromosomes built for every move
+		self.generations = generations # most generations for one move (None = until one chromosome is left)
+		self.mutation_rate = mutation_rate # chance of every chromosome to mutate in a generation
+		self.crossover = crossover # mate neighboring chromosomes of the same length
+		self.selection = selection # truncation (drop the weakest), tournament (drop the weakest of a few picked
+		                           # at random) or elitism (truncation, and the fittest are not mated or mutated)
+		self.eliminate = eliminate # chromosomes dropped every generation
+		self.tournament_size = tournament_size # chromosomes picked for every tournament
+		self.elite = elite # chromosomes kept as they are with elitism
+		self.stable_generations = stable_generations # stop once the best move stayed the same this many generations (None = never)
+		self.keep_tree = keep_tree # start from the lines left at the end of the last search that went through the new position
+		self.verbose = verbose # print the generations and time of every move
+
+# class representing what one search for a move did, the counters are the differences of the global ones
+# between the start and the end of the search (the worker processes of a parallel search are not counted)
+class SearchStats(object):
+	FIELDS = ('strategy', 'seconds', 'book', 'pondered', 'nodes', 'evaluations', 'cutoffs', 'copies', 'table_hits', 'table_probes',
+		'depths', 'generations', 'tree_size', 'chromosomes', 'kept')
+
+	def __init__(self, strategy):
+		self.strategy = strategy # strategy of the player that searched
+		self.seconds = 0 # time of the whole search
+		self.book = False # the move was taken from the opening book
+		self.pondered = False # the move was found while the opponent was thinking
+		self.nodes = 0 # positions searched
+		self.evaluations = 0 # leaves scored with the evaluation
+		self.cutoffs = 0 # beta cut-offs
+		self.copies = 0 # boards copied
+		self.table_hits = 0 # transposition table probes that found their position...
+		self.table_probes = 0 # ...out of this many
+		self.depths = [] # (depth, seconds, nodes) of every depth that was finished
+		self.generations = 0 # genetic algorithm: generations...
+		self.tree_size = 0 # ...nodes of the reservation tree at the end...
+		self.chromosomes = 0 # ...chromosomes scored...
+		self.kept = 0 # ...and chromosomes kept from the search before
+		self.startTime = time.time()
+		self.counters = search_counters() # global counters when the search started
+
+	# will add a finished depth of the search
+	def add_depth(self, depth, seconds, nodes):
+		self.depths.append((depth, seconds, nodes))
+
+	# will set the counters to what was counted since the search started
+	def finish(self):
+		counts = [now - then for now, then in zip(search_counters(), self.counters)]
+		self.nodes, self.evaluations, self.cutoffs, self.copies, self.table_hits, misses, self.chromosomes = counts
+		self.table_probes = self.table_hits + misses
+		if self.strategy == 'genetic' and not self.book and not self.pondered:
+			self.generations, self.tree_size, self.kept = generations, tree_size, kept_chromosomes
+		self.seconds = time.time() - self.startTime
+
+	def as_dict(self):
+		return dict((name, getattr(self, name)) for name in SearchStats.FIELDS)
+
+# raised inside a search when its deadline has passed
+class SearchTimeout(Exception):
+	pass
+
+# class representing the move of a computer player played on a thread, so the window keeps drawing and handling
+# events while it searches, play = cpu_play, genetic_cpu or runGenetic (and its arguments)
+class BackgroundMove(object):
+	def __init__(self, play, *arguments):
+		global search_stopped
+		search_stopped = False
+		self.position = board.copy() # the board as it was, the search moves pieces on the board itself
+		self.saved = (turn, move_limit[1], len(move_times['black']), len(move_times['white']), game_generations)
+		self.winner = None # what play returned
+		self.done = False # play has returned
+		self.cancelled = False
+		self.thread = threading.Thread(target=self.run, args=(play, arguments))
+		self.thread.daemon = True # exit() does not wait for it
+		self.thread.start()
+
+	def run(self, play, arguments):
+		try:
+			self.winner = play(*arguments)
+		except SearchTimeout: # stopped (see cancel)
+			pass
+		self.done = True
+
+	# will stop the search at its next node and put the board back as it was before the move
+	def cancel(self):
+		global board, turn, game_generations, search_stopped, deadline
+		stop_search()
+		self.thread.join()
+		board = self.position
+		turn, move_limit[1], black_moves, white_moves, game_generations = self.saved
+		del move_times['black'][black_moves:], move_times['white'][white_moves:]
+		search_stopped, deadline = False, None
+		self.cancelled = True
+
+# class representing move (its board is not kept, see Chromosome.replay)
+class Move(object):
+	__slots__ = ('moveCoordinates', 'player', 'score', 'id')
+
+	def __init__(self, moveCoordinates, player):
+		self.moveCoordinates = moveCoordinates 
+		self.player = player 
+		self.score = None # evaluation of the board after the move, set if a chromosome ends with it
+		self.id = None 
+
+# class gene object
+class Gene(object):
+	__slots__ = ('nodeId', 'move', 'score')
+
+	def __init__(self, move):
+		self.nodeId = 0 
+		self.move = move
+		self.score = 0 
+
+	def getId(self):
+		return self.nodeId 
+
+	def getMove(self):
+		return self.move 
+
+	def getScore(self):
+		return self.score 
+
+	def setId(self, id):
+		self.nodeId = id 
+
+	def setMove(self, move):
+		self.move = move 
+
+	def setScore(self, score):
+		self.score = score 
+
+# class representing chromosome
+class Chromosome(object): 
+	__slots__ = ('genes', 'geneticScore', 'root', 'node')
+
+	def __init__(self, root):
+		self.genes = [] 
+		self.geneticScore = 0  
+		self.root = root # position before the first gene (shared by all chromosomes of a move)
+		self.node = None # node of the last gene in the reservation tree (None while it is not in the tree)
+
+	def addGene(self, move):
+		gene = Gene(move) 
+		self.genes.append(gene) 
+
+	def getGenes(self):
+		return self.genes 
+
+	def getGeneticScore(self):
+		return self.geneticScore 
+
+	def setGenes(self, genes):
+		self.genes = genes 
+
+	def setGeneticScore(self, geneticScore):
+		self.geneticScore = geneticScore 
+
+	# will return the board after the first count genes, replayed from the root position
+	def replay(self, count):
+		global copies
+		copies += 1
+		board = self.root.copy()
+		for gene in self.genes[:count]:
+			make_move(board, from_coordinates(gene.move.moveCoordinates[0], gene.move.moveCoordinates[1]))
+		return board
+
+	# the children keep the moves both parents share and swap the rest, which makes them the same
+	# moves as the parents in the other order, so the parents are returned (and stay in the tree)
+	def crossover(self, other):
+		if self.genes[0].getMove().moveCoordinates == other.genes[0].getMove().moveCoordinates:
+			# The genes are compatible so they can mate 
+			for i in range(len(self.genes)):
+				if self.genes[i].getMove().moveCoordinates != other.genes[i].getMove().moveCoordinates:
+					return (other,self) 
+		# The genes are not compatible (or the same) so they reject each other and don't mate 
+		return (self,other) 
+
+	def mutate(self):
+		global evaluations
+		c = Chromosome(self.root)
+		i = random.randint(1,len(self.genes)) if len(self.genes) >= 1 else random.randint(0,len(self.genes)) 
+		for j in range(0,i):
+			c.addGene(self.genes[j].move)
+		board = self.replay(j+1) 
+		subChromosome = buildChromosome(board, self.genes[j].getMove().player, j, Chromosome(self.root)) 
+		if subChromosome != None and len(subChromosome.getGenes()) > 0:
+			for k in range(0, len(subChromosome.getGenes())):
+				c.addGene(subChromosome.getGenes()[k].getMove())  
+		elif self.genes[j].move.score == None: # the chromosome ends here now
+			evaluations += 1
+			self.genes[j].move.score = evaluate(board, self.genes[j].move.player) 
+		return c 
+
+# class representing reservation tree, kept as columns indexed by node (node 0 is the root), it holds the
+# moves of the chromosomes added to it and is updated in place from one generation to the next
+class ReservationTree(object):
+	__slots__ = ('parent', 'level', 'code', 'gene', 'player', 'minimaxScore', 'count', 'firstChild', 'lastChild',
+		'nextSibling', 'previousSibling', 'children', 'free', 'changed', 'position', 'bestScore', 'bestMove')
+
+	def __init__(self, position):
+		self.parent = [0] 
+		self.level = [0] 
+		self.code = [-1] # move into the node as source*32 + destination
+		self.gene = [None] 
+		self.player = [None] # player of the move into the node
+		self.minimaxScore = [None] 
+		self.count = [0] # chromosomes going through the node (0 = the node is free)
+		self.firstChild = [-1] # children of a node as a linked list, in the order they were added
+		self.lastChild = [-1] 
+		self.nextSibling = [-1] 
+		self.previousSibling = [-1] 
+		self.children = {} # parent*1024 + move code -> child
+		self.free = [] # nodes of removed moves, used again for new ones
+		self.changed = set() # nodes whose minimax score has to be backed up again
+		self.position = position # board at the root (the root of its chromosomes)
+		self.bestScore = -10000 
+		self.bestMove = None 
+
+	def size(self):
+		return len(self.parent) 
+
+	def addChild(self, parent, gene, code):
+		if len(self.free) > 0:
+			node = self.free.pop() 
+			self.parent[node], self.level[node], self.code[node] = parent, self.level[parent]+1, code 
+			self.gene[node], self.player[node], self.minimaxScore[node], self.count[node] = gene, gene.move.player, None, 0 
+			self.firstChild[node], self.lastChild[node], self.nextSibling[node] = -1, -1, -1 
+		else:
+			node = len(self.parent) 
+			self.parent.append(parent) 
+			self.level.append(self.level[parent]+1) 
+			self.code.append(code) 
+			self.gene.append(gene) 
+			self.player.append(gene.move.player) 
+			self.minimaxScore.append(None) # not backed up yet
+			self.count.append(0) 
+			self.firstChild.append(-1) 
+			self.lastChild.append(-1) 
+			self.nextSibling.append(-1) 
+			self.previousSibling.append(-1) 
+		self.previousSibling[node] = self.lastChild[parent] 
+		if self.firstChild[parent] == -1: self.firstChild[parent] = node 
+		else: self.nextSibling[self.lastChild[parent]] = node 
+		self.lastChild[parent] = node 
+		self.children[parent*1024 + code] = node 
+		self.changed.add(node) 
+		gene.setId(node)
+		return node 
+
+	def removeChild(self, node):
+		parent = self.parent[node] 
+		previous, next = self.previousSibling[node], self.nextSibling[node] 
+		if previous == -1: self.firstChild[parent] = next 
+		else: self.nextSibling[previous] = next 
+		if next == -1: self.lastChild[parent] = previous 
+		else: self.previousSibling[next] = previous 
+		del self.children[parent*1024 + self.code[node]] 
+		self.gene[node] = None 
+		self.free.append(node) 
+		self.changed.add(parent) 
+
+	# will add the moves of the chromosome that are not in the tree yet
+	def addChromosome(self, chromosome):
+		node = 0 
+		self.count[0] += 1 
+		for gene in chromosome.getGenes():
+			source, destination = from_coordinates(gene.move.moveCoordinates[0], gene.move.moveCoordinates[1]) 
+			child = self.children.get(node*1024 + source*32 + destination) 
+			if child == None:
+				# Add node to the tree 
+				child = self.addChild(node, gene, source*32 + destination) 
+			self.count[child] += 1 
+			node = child 
+		chromosome.node = node 
+		if node > 0 and self.gene[node].move.score == None: # the node was made by a longer line, it is a leaf once those are gone
+			self.gene[node].move.score = chromosome.getGenes()[-1].move.score 
+
+	# will take out the moves that only the chromosome had
+	def removeChromosome(self, chromosome):
+		node = chromosome.node 
+		chromosome.node = None 
+		while node > 0:
+			parent = self.parent[node] 
+			self.count[node] -= 1 
+			if self.count[node] == 0: self.removeChild(node) 
+			node = parent 
+		self.count[0] -= 1 
+
+	# will back up the minimax scores of the changed nodes (the leaves are the last moves of chromosomes,
+	# scored when they were built) deepest first, a parent only changes if the score of a child did
+	def minimaxScores(self):
+		score = self.minimaxScore 
+		levels = {} 
+		for node in self.changed:
+			if self.count[node] > 0 or node == 0: levels.setdefault(self.level[node], set()).add(node) 
+		self.changed = set() 
+		if len(levels) == 0: return 
+
+		for level in range(max(levels), 0, -1):
+			for node in levels.get(level, ()):
+				child = self.firstChild[node] 
+				if child == -1: new = self.gene[node].move.score 
+				elif self.player[node] == 'black': # black takes the highest child
+					new = -10000 
+					while child != -1:
+						if score[child] > new: new = score[child] 
+						child = self.nextSibling[child] 
+				else: # white takes the lowest child
+					new = 10000 
+					while child != -1:
+						if score[child] < new: new = score[child] 
+						child = self.nextSibling[child] 
+				if new != score[node]:
+					score[node] = new 
+					levels.setdefault(level-1, set()).add(self.parent[node]) 
+
+		if 0 in levels: # Set the best move here (every child of the root passes, so it is the last one)
+			self.bestScore, self.bestMove = -10000, None 
+			child = self.firstChild[0] 
+			while child != -1:
+				if score[child] >= -10000:
+					self.bestScore = score[child] 
+					self.bestMove = self.gene[child].getMove().moveCoordinates 
+				child = self.nextSibling[child] 
+
+	# will return the leaves (depth first, children in the order they were added) and give the genes
+	# on the way the minimax score of their node
+	def getLeaves(self):
+		leaves = [] 
+		node = self.firstChild[0] 
+		while node > 0:
+			self.gene[node].setScore(self.minimaxScore[node]) 
+			if self.firstChild[node] != -1:
+				node = self.firstChild[node] 
+				continue 
+			leaves.append(node) 
+			while node > 0 and self.nextSibling[node] == -1:
+				node = self.parent[node] 
+			if node > 0: node = self.nextSibling[node] 
+		return leaves 
+
+######################## INITIALIZE ########################
+
+# will initialize board with all the pieces
+def init_board():
+	global move_limit, game_generations
+	move_limit[1] = 0 # reset move limit
+	move_times['black'], move_times['white'], game_generations = [], [], 0 # and the times of the moves
+	for player in (black, white): # and the clocks
+		if player != (): player.time_left = player.clock
+	
+	result = [
+	[ 0, 1, 0, 1, 0, 1, 0, 1],
+	[ 1, 0, 1, 0, 1, 0, 1, 0],
+	[ 0, 1, 0, 1, 0, 1, 0, 1],
+	[ 0, 0, 0, 0, 0, 0, 0, 0],
+	[ 0, 0, 0, 0, 0, 0, 0, 0],
+	[-1, 0,-1, 0,-1, 0,-1, 0],
+	[ 0,-1, 0,-1, 0,-1, 0,-1],
+	[-1, 0,-1, 0,-1, 0,-1, 0]
+	] # initial board setting
+	for m in range(8):
+		for n in range(8):
+			if (result[m][n] == 1):
+				piece = Piece('black', False) # basic black piece
+				result[m][n] = piece
+			elif (result[m][n] == -1):
+				piece = Piece('white', False) # basic white piece
+				result[m][n] = piece
+	return board_to_position(result) # the engine plays on the bitboard
+
+# list of lists of pieces -> bitboard position
+def board_to_position(board):
+	black, white, kings = 0, 0, 0
+	for m in range(8):
+		for n in range(8):
+			if board[m][n] != 0:
+				bit = 1 << SQUARE[(m, n)]
+				if board[m][n].color == 'black': black |= bit
+				else: white |= bit
+				if board[m][n].king == True: kings |= bit
+	return Position(black, white, kings)
+
+# bitboard position -> list of lists of pieces (used for drawing)
+def position_to_board(position):
+	result = [[0]*8 for m in range(8)]
+	for m, n, color, king in pieces(position):
+		result[m][n] = Piece(color, king)
+	return result
+
+# initialize players
+def init_player(type, color, strategy, ply_depth, move_time=None, clock=None, processes=1, genetic=None):
+	return Player(type, color, strategy, ply_depth, move_time, clock, processes, genetic)
+
+######################## GENETIC ALGORITHM CODE ########################
+
+def printReservationTree(reservationTree):
+	for node in range(1, reservationTree.size()):
+		if reservationTree.count[node] > 0:
+			gene = reservationTree.gene[node]
+			print(gene.move.moveCoordinates," Id: ",node," Parent: ",reservationTree.parent[node], " Gene: ", gene)
+
+def evaluateChromosomesHelper(reservationTree, chromosomes):
+	# one chromosome for every leaf of the tree, in the order of the leaves, the others (the same
+	# moves as another chromosome, or fewer moves) are taken out of the tree
+	def chromosomesOfLeaves(leaves):
+		byLeaf = {}
+		for chromosome in chromosomes:
+			if chromosome.node in byLeaf or reservationTree.firstChild[chromosome.node] != -1:
+				reservationTree.removeChromosome(chromosome) 
+			else:
+				byLeaf[chromosome.node] = chromosome 
+		return [byLeaf[leaf] for leaf in leaves] 
+
+	def geneticEval(chromosomes):
+		global chromosomes_evaluated
+		chromosomes_evaluated += len(chromosomes)
+		for chromosome in chromosomes:
+			chromosome.setGeneticScore(0) 
+			leafVal = chromosome.getGenes()[len(chromosome.getGenes())-1].getScore()
+			for gene in chromosome.getGenes()[::-1]:
+				if gene.getScore() == leafVal:
+					chromosome.setGeneticScore(chromosome.getGeneticScore()+1) 
+		return chromosomes 
+
+	reservationTree.minimaxScores() 
+	bestScore = reservationTree.bestScore
+	bestMove = reservationTree.bestMove 
+	chromosomes = chromosomesOfLeaves(reservationTree.getLeaves()) 
+	chromosomes = geneticEval(chromosomes) 
+
+	return (chromosomes, bestScore, bestMove)  
+
+# every generation only the chromosomes that changed are taken out of and put into the reservation tree
+def evaluateChromosomes(reservationTree, chromosomes, config):
+	global generations, survivors
+	chromosomes, bestScore, bestMove = evaluateChromosomesHelper(reservationTree, chromosomes) 
+	generations, stable = 0, 0 
+	population = [list(chromosomes)] # the chromosomes of every generation
+	while len(chromosomes) > 1:
+		if config.generations != None and generations >= config.generations: break 
+		if config.stable_generations != None and stable >= config.stable_generations: break # converged
+		updateReservationTree(reservationTree, chromosomes, config) 
+		chromosomes, score, move = evaluateChromosomesHelper(reservationTree, chromosomes) 
+		population.append(list(chromosomes))
+		generations += 1 
+		if move == bestMove: stable += 1 
+		else: stable = 0 
+		bestScore, bestMove = score, move 
+		selectChromosomes(reservationTree, chromosomes, config) 
+
+	survivors, seen = [], set()
+	for chromosome in [c for generation in [chromosomes] + population[::-1] for c in generation]:
+		if id(chromosome) not in seen:
+			seen.add(id(chromosome))
+			survivors.append(chromosome)
+	if len(chromosomes) >= 1:
+		return (chromosomes[0], bestScore, bestMove)
+	else:
+		return (None,0,0)
+
+# will drop the chromosomes of this generation that do not survive (the fittest come first afterwards)
+def selectChromosomes(reservationTree, chromosomes, config):
+	chromosomes.sort(key=lambda x: -x.getGeneticScore()) 
+	for i in range(min(config.eliminate, len(chromosomes)-1)):
+		if config.selection == 'tournament':
+			picked = random.sample(range(len(chromosomes)), min(config.tournament_size, len(chromosomes))) 
+			weakest = max(picked) # the fittest come first
+		else: weakest = len(chromosomes)-1 
+		reservationTree.removeChromosome(chromosomes.pop(weakest)) 
+
+def buildReservationTree(chromosomes, config):
+	reservationTree = ReservationTree(chromosomes[0].root if len(chromosomes) > 0 else None)
+	updateReservationTree(reservationTree, chromosomes, config) 
+	return reservationTree
+
+# will mate and mutate the chromosomes (in place) and bring the tree up to date with them
+def updateReservationTree(reservationTree, chromosomes, config):
+	elite = set() # the fittest chromosomes with elitism (they come first after selectChromosomes), left alone
+	if config.selection == 'elitism' and reservationTree.size() > 1:
+		for chromosome in chromosomes[:config.elite]:
+			elite.add(id(chromosome)) 
+
+	# crossover 
+	if config.crossover and len(chromosomes) > 1:
+		for i in range(0, len(chromosomes)-1):
+			if id(chromosomes[i]) in elite or id(chromosomes[i+1]) in elite: continue 
+			if len(chromosomes[i].getGenes()) == len(chromosomes[i+1].getGenes()):
+				c1, c2 = chromosomes[i].crossover(chromosomes[i+1]) 
+				chromosomes[i] = c1 
+				chromosomes[i+1] = c2 
+
+	# mutation 
+	for i in range(0, len(chromosomes)):
+		if random.uniform(0,1) >= 1 - config.mutation_rate and id(chromosomes[i]) not in elite:
+			c = chromosomes[i].mutate()
+			if chromosomes[i].node != None: # add the new moves before the old ones go, so the shared ones stay put
+				reservationTree.addChromosome(c) 
+				reservationTree.removeChromosome(chromosomes[i]) 
+			chromosomes[i] = c
+	
+	for chromosome in chromosomes:
+		if chromosome.node == None: reservationTree.addChromosome(chromosome) 
+
+def buildChromosome(board, player, ply, chromosome):
+	global nodes
+	nodes += 1
+	ply_depth = search_depth 
+	if deadline != None and time.time() >= deadline: raise SearchTimeout()
+
+	end = end_game(board) 
+
+	if ply >= ply_depth or end[0] == 0 or end[1] == 0:
+		scoreLeaf(board, chromosome) 
+		return 
+ 
+	moves = avail_moves(board, player) 
+	if len(moves) <= 0:
+		scoreLeaf(board, chromosome) 
+		return None 
+	i = random.randint(0, len(moves)-1)
+	undo = make_move(board, moves[i]) # play the move on the board, it is taken back after the rollout
+
+	move = Move(list(to_coordinates(moves[i])), player) 
+	chromosome.addGene(move)
+
+	if player == 'black': player = 'white' 
+	else: player = 'black' 
+
+	buildChromosome(board, player, ply+1, chromosome)
+	unmake_move(board, undo) 
+
+	return chromosome 
+
+# the board at the end of a chromosome is only seen here, so its last move gets its evaluation
+def scoreLeaf(board, chromosome):
+	global evaluations
+	if len(chromosome.getGenes()) > 0:
+		move = chromosome.getGenes()[-1].getMove()
+		if move.player == 'black': exact = probe_tablebase(board, 'white')
+		else: exact = probe_tablebase(board, 'black')
+		if exact != None: move.score = -exact # the opponent is to move on the tablebase position
+		else:
+			evaluations += 1
+			move.score = evaluate(board, move.player) 
+
+# will return the chromosomes left at the end of the last genetic search of player whose moves go through position
+# (the plies played since, none if the same position is searched deeper, so only one board is made for each
+# distinct first moves) re-rooted
+# there: the moves before it are dropped and only the frontier is rolled out again, from the last move of each
+# line to the full depth, the other lines (and so the rest of the old reservation tree) are dropped
+def keptChromosomes(position, player, numChromosomes):
+	global copies
+	played, lines = genetic_lines.pop(player, (0, []))
+	played = move_limit[1] - played # plies played since (0 if the same position is searched deeper)
+	kept, seen = [], set()
+	reached = {} # first moves of a line -> they lead to position
+	for chromosome in lines:
+		if len(kept) >= numChromosomes: break
+		genes = chromosome.getGenes()
+		if played < 0 or len(genes) <= played: continue
+		prefix = tuple(from_coordinates(*gene.move.moveCoordinates) for gene in genes[:played])
+		if prefix not in reached:
+			board = chromosome.root.copy()
+			copies += 1
+			for move in prefix: make_move(board, move)
+			reached[prefix] = board == position
+		if not reached[prefix]: continue # the game went another way
+		line = tuple(from_coordinates(*gene.move.moveCoordinates) for gene in genes[played:])
+		if line in seen: continue # another chromosome has the same moves from here
+		seen.add(line)
+
+		if len(kept) == 0:
+			root = position.copy() # shared by the kept chromosomes
+			copies += 1
+		chromosome.setGenes(genes[played:])
+		chromosome.root, chromosome.node = root, None
+		length = len(chromosome.getGenes())
+		if length < search_depth: # the leaf moved up, roll the line out again from there
+			if chromosome.getGenes()[-1].getMove().player == 'black': opponent = 'white'
+			else: opponent = 'black'
+			buildChromosome(chromosome.replay(length), opponent, length, chromosome)
+		kept.append(chromosome)
+	return kept
+
+def getAllChromosomes(board, player, ply, numChromosomes, processes=1):
+	if processes > 1: return parallel_chromosomes(board, player, ply, numChromosomes, processes)
+	global copies
+	copies += 1
+	chromosomeList = []  
+	root = board.copy() 
+	counter = 0 
+	while counter < numChromosomes:
+		chromosomeList.append(buildChromosome(board, player, ply, Chromosome(root))) 
+		counter = counter + 1 
+	return chromosomeList 
+
+######################## GENETIC ALGORITHM CODE ########################
+
+# will generate possible moves and board states until a given depth
+''' http://en.wikipedia.org/wiki/Minimax '''
+''' function minimax(node, depth) '''
+def minimax(board, player, ply):
+	global best_move, nodes, evaluations
+	nodes += 1
+	ply_depth = search_depth # find out ply depth for the search
+
+	end = end_game(board)
+
+	if ply > 0:
+		exact = probe_tablebase(board, player) # a position with few pieces left is solved already
+		if exact != None:
+			if player == turn: return exact
+			return -exact
+
+	''' if node is a terminal node or depth = CutoffDepth '''
+	if ply >= ply_depth or end[0] == 0 or end[1] == 0: # are we still playing?
+		''' return the heuristic value of node '''
+		evaluations += 1
+		score = evaluate(board, turn) # return evaluation of board (for the player to move at the root)
+		return score
+
+	if deadline != None and time.time() >= deadline: raise SearchTimeout() # out of time
+
+	# ...players switch for the children
+	if player == 'black': opponent = 'white'
+	else: opponent = 'black'
+
+	''' if the adversary is to play at node '''
+	if player != turn: # if the opponent is to play on this node...
+		
+		''' let beta := +infinity '''
+		beta = +10000
+		
+		''' foreach child of node '''
+		moves = avail_moves(board, player) # get the available moves for player
+		for move in moves:
+			undo = make_move(board, move) # make move on the board
+			
+			''' beta := min(beta, minimax(child, depth+1)) '''
+			temp_beta = minimax(board, opponent, ply+1)
+			unmake_move(board, undo) # and take it back
+			if temp_beta < beta:
+				beta = temp_beta # take the lowest beta
+
+		''' return beta '''
+		return beta
+	
+	else: # else we are to play
+		''' else {we are to play at node} '''
+		''' let alpha := -infinity '''
+		alpha = -10000
+		
+		''' foreach child of node '''
+		moves = avail_moves(board, player) # get the available moves for player
+		for move in moves:
+			undo = make_move(board, move) # make move on the board
+							
+			''' alpha := max(alpha, minimax(child, depth+1)) '''
+			temp_alpha = minimax(board, opponent, ply+1)
+			unmake_move(board, undo) # and take it back
+			if temp_alpha > alpha:
+				alpha = temp_alpha # take the highest alpha
+				if ply == 0: best_move = to_coordinates(move) # save the move as it's our turn
+
+		''' return alpha '''
+		return alpha
+
+''' http://en.wikipedia.org/wiki/Negascout '''
+''' function negascout(node, depth, alpha, beta) '''
+def negascout(board, ply, alpha, beta, player):
+	global best_move, nodes, evaluations
+	nodes += 1
+
+	ply_depth = search_depth # find out ply depth for the search
+
+	end = end_game(board)
+
+	if ply > 0:
+		exact = probe_tablebase(board, player) # a position with few pieces left is solved already
+		if exact != None: return exact
+	
+	''' if node is a terminal node or depth = 0 '''
+	if ply >= ply_depth or end[0] == 0 or end[1] == 0: # are we still playing?
+		''' return the heuristic value of node '''
+		evaluations += 1
+		score = evaluate(board, player) # return evaluation of board as we have reached final ply or end state
+		return score
+
+	if deadline != None and time.time() >= deadline: raise SearchTimeout() # out of time
+
+	# look the position up in the transposition table
+	key = hash_key(board, player)
+	alpha_orig = alpha
+	entry = transposition.probe(key)
+	if entry != None and entry[1] >= ply_depth - ply and ply > 0:
+		if entry[2] == EXACT: return entry[3]
+		elif entry[2] == LOWER and entry[3] > alpha: alpha = entry[3]
+		elif entry[2] == UPPER and entry[3] < beta: beta = entry[3]
+		if alpha >= beta: return entry[3]
+
+	# ...players switch for the children
+	if player == 'black': opponent = 'white'
+	else: opponent = 'black'
+
+	''' b := beta '''
+	b = beta
+	best = None # best move on this node (for the transposition table)
+
+	''' foreach child of node '''
+	moves = avail_moves(board, player) # get the available moves for player
+	order_moves(moves, entry[4] if entry != None else None, player, ply) # most promising moves first
+	for i in range(len(moves)):
+		undo = make_move(board, moves[i]) # make move on the board
+
+		''' score := -negascout (child, depth-1, -b, -alpha) '''
+		score = -negascout(board, ply+1, -b, -alpha, opponent)
+		''' if alpha < score < beta and child is not first child '''
+		if alpha < score < beta and i > 0: # check if null-window failed high
+			''' score := -negascout(child, depth-1, -beta, -score) '''
+			score = -negascout(board, ply+1, -beta, -score, opponent) # full re-search
+		unmake_move(board, undo) # and take the move back
+		''' alpha := max(alpha, score) '''
+		if score > alpha:
+			alpha = score
+			best = moves[i]
+			if ply == 0: best_move = to_coordinates(moves[i]) # save the move
+		''' if alpha >= beta '''
+		if alpha >= beta:
+			transposition.store(key, ply_depth - ply, LOWER, alpha, best)
+			cutoff(moves[i], player, ply, ply_depth - ply)
+			''' return alpha '''
+			return alpha # beta cut-off
+		''' b := alpha+1 '''
+		b = alpha+1 # set new null window
+	if alpha <= alpha_orig: transposition.store(key, ply_depth - ply, UPPER, alpha, best)
+	else: transposition.store(key, ply_depth - ply, EXACT, alpha, best)
+	''' return alpha '''
+	return alpha
+
+''' http://en.wikipedia.org/wiki/Negamax '''
+''' function negamax(node, depth, alpha, beta) '''
+def negamax(board, ply, alpha, beta, player):
+	global best_move, nodes, evaluations
+	nodes += 1
+
+	ply_depth = search_depth # find out ply depth for the search
+
+	end = end_game(board)
+
+	if ply > 0:
+		exact = probe_tablebase(board, player) # a position with few pieces left is solved already
+		if exact != None: return exact
+
+	''' if node is a terminal node or depth = 0 '''
+	if ply >= ply_depth or end[0] == 0 or end[1] == 0: # are we still playing?
+		''' return the heuristic value of node '''
+		evaluations += 1
+		score = evaluate(board, player) # return evaluation of board as we have reached final ply or end state
+		return score
+
+	if deadline != None and time.time() >= deadline: raise SearchTimeout() # out of time
+
+	# look the position up in the transposition table
+	key = hash_key(board, player)
+	alpha_orig = alpha
+	entry = transposition.probe(key)
+	if entry != None and entry[1] >= ply_depth - ply and ply > 0:
+		if entry[2] == EXACT: return entry[3]
+		elif entry[2] == LOWER and entry[3] > alpha: alpha = entry[3]
+		elif entry[2] == UPPER and entry[3] < beta: beta = entry[3]
+		if alpha >= beta: return entry[3]
+
+	# ...players switch for the children
+	if player == 'black': opponent = 'white'
+	else: opponent = 'black'
+
+	best = None # best move on this node (for the transposition table)
+
+	''' else '''
+	''' foreach child of node '''
+	moves = avail_moves(board, player) # get the available moves for player
+	order_moves(moves, entry[4] if entry != None else None, player, ply) # most promising moves first
+	for move in moves:
+		undo = make_move(board, move) # make move on the board
+
+		''' alpha := max(alpha, -negamax(child, depth-1, -beta, -alpha)) '''
+		temp_alpha = -negamax(board, ply+1, -beta, -alpha, opponent)
+		unmake_move(board, undo) # and take it back
+		if temp_alpha > alpha:
+			if ply == 0: best_move = to_coordinates(move) # save the move
+			alpha = temp_alpha
+			best = move
+
+		''' {the following if statement constitutes alpha-beta pruning} '''
+		''' if alpha>=beta '''
+		if alpha >= beta:
+			transposition.store(key, ply_depth - ply, LOWER, beta, best)
+			cutoff(move, player, ply, ply_depth - ply)
+			''' return beta '''
+			if ply == 0: best_move = to_coordinates(move) # save the move
+			return beta
+	if alpha <= alpha_orig: transposition.store(key, ply_depth - ply, UPPER, alpha, best)
+	else: transposition.store(key, ply_depth - ply, EXACT, alpha, best)
+	''' return alpha '''
+	return alpha
+
+''' http://www.ocf.berkeley.edu/~yosenl/extras/alphabeta/alphabeta.html '''
+''' alpha-beta(player,board,alpha,beta) '''
+def alpha_beta(player, board, ply, alpha, beta):
+	global best_move, nodes, evaluations
+	nodes += 1
+	ply_depth = search_depth # find out ply depth for the search
+
+	end = end_game(board)
+
+	if ply > 0:
+		exact = probe_tablebase(board, player) # a position with few pieces left is solved already
+		if exact != None:
+			if player == turn: return exact
+			return -exact
+
+	''' if(game over in current board position) '''
+	if ply >= ply_depth or end[0] == 0 or end[1] == 0: # are we still playing?
+		''' return winner '''
+		evaluations += 1
+		score = evaluate(board, turn) # return evaluation of board (for the player to move at the root)
+		return score
+
+	if deadline != None and time.time() >= deadline: raise SearchTimeout() # out of time
+
+	# look the position up in the transposition table (it keeps scores for the player to move, we keep them for turn)
+	key = hash_key(board, player)
+	alpha_orig, beta_orig = alpha, beta
+	entry = transposition.probe(key)
+	if entry != None and entry[1] >= ply_depth - ply and ply > 0:
+		if player == turn: bound, score = entry[2], entry[3]
+		else: bound, score = FLIP[entry[2]], -entry[3]
+		if bound == EXACT: return score
+		elif bound == LOWER and score > alpha: alpha = score
+		elif bound == UPPER and score < beta: beta = score
+		if alpha >= beta: return score
+
+	# ...players switch for the children
+	if player == 'black': opponent = 'white'
+	else: opponent = 'black'
+
+	best = None # best move on this node (for the transposition table)
+
+	''' children = all legal moves for player from this board '''
+	moves = avail_moves(board, player) # get the available moves for player
+	order_moves(moves, entry[4] if entry != None else None, player, ply) # most promising moves first
+
+	''' if(max's turn) '''
+	if player == turn: # if we are to play on node...
+		''' for each child '''
+		for move in moves:
+			undo = make_move(board, move) # make move on the board
+
+			''' score = alpha-beta(other player,child,alpha,beta) '''
+			score = alpha_beta(opponent, board, ply+1, alpha, beta)
+			unmake_move(board, undo) # and take it back
+
+			''' if score > alpha then alpha = score (we have found a better best move) '''
+			if score > alpha:
+				if ply == 0: best_move = to_coordinates(move) # save the move
+				alpha = score
+				best = move
+			''' if alpha >= beta then return alpha (cut off) '''
+			if alpha >= beta:
+				transposition.store(key, ply_depth - ply, LOWER, alpha, best)
+				cutoff(move, player, ply, ply_depth - ply)
+				return alpha
+
+		if alpha <= alpha_orig: transposition.store(key, ply_depth - ply, UPPER, alpha, best)
+		else: transposition.store(key, ply_depth - ply, EXACT, alpha, best)
+		''' return alpha (this is our best move) '''
+		return alpha
+
+	else: # the opponent is to play on this node...
+		''' else (min's turn) '''
+		''' for each child '''
+		for move in moves:
+			undo = make_move(board, move) # make move on the board
+
+			''' score = alpha-beta(other player,child,alpha,beta) '''
+			score = alpha_beta(opponent, board, ply+1, alpha, beta)
+			unmake_move(board, undo) # and take it back
+
+			''' if score < beta then beta = score (opponent has found a better worse move) '''
+			if score < beta:
+				beta = score
+				best = move
+			''' if alpha >= beta then return beta (cut off) '''
+			if alpha >= beta:
+				transposition.store(key, ply_depth - ply, LOWER, -beta, best) # an upper bound for turn
+				cutoff(move, player, ply, ply_depth - ply)
+				return beta
+		if beta >= beta_orig: transposition.store(key, ply_depth - ply, UPPER, -beta, best)
+		else: transposition.store(key, ply_depth - ply, EXACT, -beta, best)
+		''' return beta (this is the opponent's best move) '''
+		return beta
+
+# end turn
+def end_turn():
+	global turn # use global variables
+
+	if turn != 'black':	turn = 'black'
+	else: turn = 'white'
+
+# will sort moves so the ones most likely to cause a cut-off come first: move (the best move of an earlier
+# search), then the killer moves of this ply, then the rest by history score (jumps are forced, so there is
+# never a mix of captures and quiet moves to sort)
+def order_moves(moves, move, player, ply):
+	if move_ordering and len(moves) > 1:
+		scores = history[player]
+		moves.sort(key=lambda m: -scores[m[0]*32 + m[1]]) # stable, ties stay in board-scan order
+		if ply in killers:
+			for killer in killers[ply][::-1]:
+				if killer != None and killer in moves:
+					moves.remove(killer)
+					moves.insert(0, killer)
+	if move != None and move in moves:
+		moves.remove(move)
+		moves.insert(0, move)
+	return moves
+
+# move caused a cut-off at ply with depth ply left: keep it as killer move and raise its history score
+def cutoff(move, player, ply, depth):
+	global cutoffs
+	cutoffs += 1
+	if move_ordering:
+		if ply not in killers: killers[ply] = [None, None]
+		if killers[ply][0] != move:
+			killers[ply][1] = killers[ply][0]
+			killers[ply][0] = move
+		history[player][move[0]*32 + move[1]] += depth*depth
+
+# will forget the killer moves and history scores (before a new search)
+def clear_ordering():
+	killers.clear()
+	for player in ('black', 'white'):
+		history[player] = [0]*1024
+
+# will return the exact score of the position for player (to move) from the endgame tablebase, or None
+# if there is no tablebase or the position is not in it
+def probe_tablebase(board, player):
+	if endgame_tablebase == None: return None
+	return endgame_tablebase.probe(board, player)
+
+# will search position with the strategy of player to search_depth and leave the move in best_move
+# returns the score of the move (None if the genetic algorithm did not come up with a move)
+def search(player, position):
+	global best_move, tree_size, kept_chromosomes
+	if player.processes > 1 and player.strategy != 'genetic': return parallel_search(player, position)
+	elif player.strategy == 'minimax': return minimax(position, player.color, 0)
+	elif player.strategy == 'negascout': return negascout(position, 0, -10000, +10000, player.color)
+	elif player.strategy == 'negamax': return negamax(position, 0, -10000, +10000, player.color)
+	elif player.strategy == 'alpha-beta': return alpha_beta(player.color, position, 0, -10000, +10000)
+	elif player.strategy == 'genetic':
+		kept = []
+		if player.genetic.keep_tree: kept = keptChromosomes(position, player.color, player.genetic.population)
+		kept_chromosomes = len(kept)
+		chromosomes = kept + getAllChromosomes(position, player.color, 0, player.genetic.population - len(kept), player.processes) 
+		if len(chromosomes) == 0 or None in chromosomes:
+			return None 
+		reservationTree = buildReservationTree(chromosomes, player.genetic) 
+		chromosome,alpha,move = evaluateChromosomes(reservationTree, chromosomes, player.genetic) 
+		tree_size = reservationTree.size()
+		if player.genetic.keep_tree: genetic_lines[player.color] = (move_limit[1], survivors)
+		if chromosome == None and alpha == 0 and move == 0:
+			return None 
+		best_move = move 
+		return alpha 
+
+# will return the number of seconds player may think about this move (None = search to ply_depth)
+def move_budget(player):
+	if player.clock == None: return player.move_time
+	moves_to_go = max(1, min(30, (move_limit[0] - move_limit[1] + 1) // 2)) # our moves left before a draw is declared
+	budget = max(0, player.time_left) / float(moves_to_go)
+	if player.move_time != None: budget = min(budget, player.move_time)
+	return budget
+
+# will find the move for player on the main board (left in best_move), returns its score
+def think(player):
+	global search_depth, deadline, best_move, generations, search_stats, copies
+	startTime = time.time()
+	search_stats = SearchStats(player.strategy)
+	if opening_book != None:
+		entry = opening_book.probe(hash_key(board, player.color))
+		if entry != None and entry[0] in avail_moves(board, player.color): # a book position (keys could collide)
+			best_move, generations = to_coordinates(entry[0]), 0
+			search_stats.book = True
+			if player.clock != None: player.time_left -= time.time() - startTime
+			return finish_search(player, entry[1])
+	if player.color in ponders:
+		found = pondered(player)
+		if found != None and found[0] in avail_moves(board, player.color): # the opponent played the expected reply
+			best_move, generations = to_coordinates(found[0]), found[2]
+			search_stats.pondered = True
+			if player.clock != None: player.time_left -= time.time() - startTime
+			return finish_search(player, found[1])
+
+	transposition.new_search() # entries from earlier moves are replaced first
+	clear_ordering() # killer moves and history are kept for all depths of this search only
+
+	budget = move_budget(player)
+	if budget == None: # search to a fixed depth
+		search_depth = player.ply_depth
+		score = search(player, board)
+		search_stats.add_depth(search_depth, time.time() - startTime, nodes - search_stats.counters[0])
+		return finish_search(player, score)
+
+	''' iterative deepening: search 1, 2, 3... ply deep until the time is up, the
+	    transposition table keeps the best moves of each depth for the next one '''
+	position = board.copy() # an interrupted search leaves its moves on the board
+	copies += 1
+	alpha, found = None, ()
+	for depth in range(1, max_ply+1):
+		search_depth = depth
+		if depth > 1 and not search_stopped: deadline = startTime + budget # the first depth always finishes
+		depthTime, depthNodes = time.time(), nodes
+		try:
+			score = search(player, position)
+		except SearchTimeout:
+			if search_stopped: raise # not out of time but stopped (see stop_search)
+			break
+		search_stats.add_depth(depth, time.time() - depthTime, nodes - depthNodes)
+		alpha, found = score, best_move # result of the last completed depth
+		if time.time() >= startTime + budget: break
+	deadline = None
+	best_move = found
+
+	if player.clock != None: player.time_left -= time.time() - startTime
+	return finish_search(player, alpha)
+
+# will return the global counters SearchStats takes the differences of
+def search_counters():
+	return nodes, evaluations, cutoffs, copies, transposition.hits, transposition.misses, chromosomes_evaluated
+
+# will finish the SearchStats of the move of player, returns score
+def finish_search(player, score):
+	search_stats.finish()
+	if show_stats: print("Search: ", search_stats.as_dict())
+	return score
+
+# will return the p-th percentile (nearest rank) of values for every p of ps
+def percentiles(values, ps=(50, 95, 99)):
+	ordered = sorted(values)
+	return [ordered[max(1, -(-p*len(ordered) // 100)) - 1] for p in ps]
+
+# play as a computer
+def cpu_play(player):
+	startTime = time.time() 
+	global board, move_limit# global variables
+
+	# find and print the best move for cpu
+	alpha = think(player)
+	#print player.color, alpha
+	winner = None
+	if alpha == -10000: # no more moves available... all is lost
+		if player.color == 'white': 
+			winner = "black"
+		else: 
+			winner = "white"
+	else:
+		make_move(board, from_coordinates(best_move[0], best_move[1])) # make the move on board
+
+	move_limit[1] += 1 # add to move limit
+
+	end_turn() # end turn
+	endTime = time.time() 
+	move_times[player.color].append(endTime - startTime) # before pondering, its guess is not part of the move
+	if ponder and winner == None: start_ponder(player)
+	return winner # None while the game goes on
+
+# genetic cpu 
+def genetic_cpu(player):
+	global game_generations
+	startTime = time.time() 
+	global board, move_limit# global variables
+
+	# find and print the best move for cpu
+	alpha = think(player)
+	game_generations += generations 
+	if player.genetic.verbose: print("Genetic move: ", generations, " generations, ", time.time() - startTime, " seconds") 
+	if alpha == None: # the genetic algorithm came up with no move, pass
+		'''if player.color == white: 
+			show_winner("black")
+		else: 
+			show_winner("white")'''
+		move_limit[1] += 1 
+		end_turn() 
+		endTime = time.time() 
+		move_times[player.color].append(endTime - startTime)
+		return 
+
+	winner = None
+	if alpha == -10000: # no more moves available... all is lost
+		if player.color == 'white': 
+			winner = "black"
+		else: 
+			winner = "white"
+	else:
+		make_move(board, from_coordinates(best_move[0], best_move[1])) # make the move on board
+
+	move_limit[1] += 1 # add to move limit
+
+	end_turn() # end turn
+	endTime = time.time() 
+	move_times[player.color].append(endTime - startTime) # before pondering, its guess is not part of the move
+	if ponder and winner == None: start_ponder(player)
+	return winner # None while the game goes on
+
+# make changes to ply's if playing vs genetic (problem with scope)
+def ply_check():
+	global black, white
+
+	''' if genetic has higher ply_setting, cpu will do unnecessary calculations '''
+	if black.type != 'cpu': black.ply_depth = white.ply_depth
+	elif white.type != 'cpu': white.ply_depth = black.ply_depth
+
+# will check for errors in players settings
+def player_check():
+	global black, white
+
+	if black.type != 'cpu' or black.type != 'genetic': black.type = 'cpu'
+	if white.type != 'cpu' or white.type != 'genetic': white.type = 'cpu'
+
+	if black.ply_depth <0: black.ply_depth = 1
+	if white.ply_depth <0: white.ply_depth = 1
+
+	if black.color != 'black': black.color = 'black'
+	if white.color != 'white': white.color = 'white'
+
+	if black.strategy != 'minimax' or black.strategy != 'negascout':
+		if black.strategy != 'negamax' or black.strategy != 'alpha-beta': black.strategy = 'alpha-beta'
+	if white.strategy != 'minimax' or white.strategy != 'negascout':
+		if white.strategy != 'negamax' or white.strategy != 'alpha-beta': white.strategy = 'alpha-beta'
+
+# initialize players and the boardfor the game
+def game_init(difficulty):
+	global black, white # work with global variables
+	difficulty = str(difficulty) # the experiment passes the ply as a number
+	if difficulty == '6':
+		black = init_player('cpu', 'black', 'minimax', 6, move_time, game_clock, search_processes) # init black player
+		white = init_player('genetic', 'white', 'minimax', 6, move_time, game_clock, search_processes, genetic_config) # init white player
+		board = init_board()
+	elif difficulty == '5':
+		black = init_player('cpu', 'black', 'minimax', 5, move_time, game_clock, search_processes) # init black player
+		white = init_player('genetic', 'white', 'minimax', 5, move_time, game_clock, search_processes, genetic_config) # init white player
+		board = init_board()
+	elif difficulty == '4':
+		black = init_player('cpu', 'black', 'minimax', 4, move_time, game_clock, search_processes) # init black player
+		white = init_player('genetic', 'white', 'minimax', 4, move_time, game_clock, search_processes, genetic_config) # init white player
+		board = init_board()
+	elif difficulty == '3':
+		black = init_player('cpu', 'black', 'minimax', 3, move_time, game_clock, search_processes) # init black player
+		white = init_player('genetic', 'white', 'minimax', 3, move_time, game_clock, search_processes, genetic_config) # init white player
+		board = init_board()
+	elif difficulty == '2':
+		black = init_player('cpu', 'black', 'minimax', 2, move_time, game_clock, search_processes) # init black player
+		white = init_player('genetic', 'white', 'minimax', 2, move_time, game_clock, search_processes, genetic_config) # init white player
+		board = init_board()
+	else:
+		black = init_player('cpu', 'black', 'minimax', 1, move_time, game_clock, search_processes) # init black player
+		white = init_player('genetic', 'white', 'minimax', 1, move_time, game_clock, search_processes, genetic_config) # init white player
+		board = init_board()
+
+	return board			
+
+######################## PARALLEL SEARCH ########################
+
+# will return the pool of worker processes for the parallel search and the genetic algorithm (started once and reused for every move)
+def parallel_pool(processes):
+	global search_pool, search_pool_size, search_pool_settings, shared_alpha, search_cancel
+	settings = worker_settings()
+	if search_pool == None or search_pool_size != processes or search_pool_settings != settings: # restarted when a tablebase, book or weights are loaded
+		if search_pool != None: search_pool.terminate()
+		shared_alpha = multiprocessing.Value('i', -10000)
+		search_cancel = multiprocessing.Value('i', search_count)
+		search_pool = multiprocessing.Pool(processes, init_search_worker, (shared_alpha, search_cancel, settings))
+		search_pool_size, search_pool_settings = processes, settings
+	return search_pool
+
+# runs in every worker process of the parallel search when it starts
+def init_search_worker(alpha, cancel, settings):
+	global shared_alpha, search_cancel
+	shared_alpha = alpha
+	search_cancel = cancel
+	load_worker_settings(settings)
+	leave_process_group()
+
+# will return what a worker process needs to search like this one: (tablebase filename, book filename,
+# piece-square tables, transposition table size), a worker that is spawned instead of forked starts from the
+# defaults of the modules
+def worker_settings():
+	tablebase_file, book_file = None, None
+	if endgame_tablebase != None: tablebase_file = endgame_tablebase.filename
+	if opening_book != None: book_file = opening_book.filename
+	return tablebase_file, book_file, [list(table) for table in PIECE_SQUARE], transposition.size
+
+# runs in a worker process before it searches, opens the tablebase and the book of settings (see worker_settings)
+# unless it has them already (a forked worker does) and sets the piece-square tables and the transposition table size
+def load_worker_settings(settings):
+	global endgame_tablebase, opening_book
+	tablebase_file, book_file, tables, size = settings
+	if tablebase_file == None: endgame_tablebase = None
+	elif endgame_tablebase == None or endgame_tablebase.filename != tablebase_file: endgame_tablebase = Tablebase(tablebase_file)
+	if book_file == None: opening_book = None
+	elif opening_book == None or opening_book.filename != book_file: opening_book = OpeningBook(book_file)
+	if tables != PIECE_SQUARE: set_weights(tables)
+	if size != transposition.size: transposition.resize(size)
+
+# will move a worker process out of the process group of the window, so the signals sent to the group (ctrl-c,
+# timeout) only reach the window, which stops its workers with shutdown: a worker killed while it waits for a
+# task keeps the lock on the tasks of its pool, and Pool.terminate would wait for that lock forever
+def leave_process_group():
+	if hasattr(os, 'setpgrp'): os.setpgrp() # not on windows
+
+# will return what the workers sent back for result (a multiprocessing AsyncResult), raises SearchTimeout if the
+# search is stopped first (see stop_search), so a stopped search never waits for the workers
+def wait_result(result):
+	while not result.ready():
+		if search_stopped: raise SearchTimeout()
+		result.wait(0.05)
+	return result.get()
+
+''' root splitting: every root move is searched by one of the workers with the best score found so far
+    (minus one, so equal scores come back exact) as lower bound, and like the serial search the first
+    move in move order with the highest score is played, so both play the same move at the same depth '''
+def parallel_search(player, position):
+	global best_move, search_count
+	moves = avail_moves(position, player.color)
+	if len(moves) == 0: return -10000 # no more moves available
+	if player.strategy != 'minimax': # same order as the serial search (minimax does not order its moves)
+		entry = transposition.probe(hash_key(position, player.color))
+		order_moves(moves, entry[4] if entry != None else None, player.color, 0)
+
+	pool = parallel_pool(player.processes)
+	shared_alpha.value = -10000
+	tasks = []
+	for move in moves:
+		tasks.append((position.black, position.white, position.kings, player.color, turn, move, search_depth, player.strategy, deadline, search_count))
+	search_count += 1 # stop_search stops the tasks from here on
+	scores = wait_result(pool.map_async(search_root_move, tasks, 1)) # one move at a time, in move order
+
+	if None in scores: raise SearchTimeout() # a worker ran out of time
+	alpha, best = -10000, None
+	for i in range(len(moves)):
+		if scores[i] > alpha:
+			alpha, best = scores[i], moves[i]
+	if best != None:
+		best_move = to_coordinates(best)
+		transposition.store(hash_key(position, player.color), search_depth, EXACT, alpha, best)
+	return alpha
+
+# will search one root move in a worker process, task = (black, white, kings, player, turn, move, depth,
+# strategy, deadline, number of the search), returns the score of the move for the player (None if the deadline
+# passed or the search was stopped)
+def search_root_move(task):
+	global search_depth, turn, deadline
+	black_mask, white_mask, kings, player, turn, move, search_depth, strategy, deadline, number = task
+	if search_cancel.value > number: return None # stopped before it started
+	finished = watch_cancel(search_cancel, number)
+	transposition.new_search()
+	clear_ordering()
+	position = Position(black_mask, white_mask, kings)
+	make_move(position, move)
+	if player == 'black': opponent = 'white'
+	else: opponent = 'black'
+
+	alpha = shared_alpha.value - 1 # moves worse than the best so far only need to fail low
+	try:
+		if strategy == 'minimax': score = minimax(position, opponent, 1)
+		elif strategy == 'negascout': score = -negascout(position, 1, -10000, -alpha, opponent)
+		elif strategy == 'negamax': score = -negamax(position, 1, -10000, -alpha, opponent)
+		else: score = alpha_beta(opponent, position, 1, alpha, +10000)
+	except SearchTimeout:
+		return None
+	finally:
+		finished.set()
+		deadline = None
+
+	with shared_alpha.get_lock():
+		if score > shared_alpha.value: shared_alpha.value = score
+	return score
+
+# will build numChromosomes chromosomes in the worker pool, the workers get the masks of the position and
+# send back only the moves of their rollout and the score of its leaf
+def parallel_chromosomes(board, player, ply, numChromosomes, processes):
+	global copies, search_count
+	pool = parallel_pool(processes)
+	tasks = []
+	for i in range(numChromosomes): # every rollout gets its own seed so it does not matter which worker runs it
+		tasks.append((board.black, board.white, board.kings, player, ply, search_depth, random.getrandbits(32), deadline, search_count))
+	search_count += 1 # stop_search stops the tasks from here on
+	rollouts = wait_result(pool.map_async(build_rollout, tasks, 1))
+	root = board.copy()
+	copies += 1
+
+	if None in rollouts: raise SearchTimeout() # a worker ran out of time
+	chromosomeList = []
+	for moves, score in rollouts:
+		if len(moves) == 0: # no chromosome could be built
+			chromosomeList.append(None)
+			continue
+		chromosome = Chromosome(root)
+		color = player
+		for move in moves:
+			chromosome.addGene(Move(list(to_coordinates(move)), color))
+			if color == 'black': color = 'white'
+			else: color = 'black'
+		chromosome.getGenes()[-1].getMove().score = score
+		chromosomeList.append(chromosome)
+	return chromosomeList
+
+# will build one chromosome in a worker process, task = (black, white, kings, player, ply, depth, seed, deadline,
+# number of the search), returns (moves of the chromosome as squares, score of its leaf) or None if the deadline
+# passed or the search was stopped
+def build_rollout(task):
+	global search_depth, deadline
+	black_mask, white_mask, kings, player, ply, search_depth, seed, deadline, number = task
+	if search_cancel.value > number: return None # stopped before it started
+	finished = watch_cancel(search_cancel, number)
+	random.seed(seed)
+	try:
+		position = Position(black_mask, white_mask, kings)
+		chromosome = buildChromosome(position, player, ply, Chromosome(position))
+	except SearchTimeout:
+		return None
+	finally:
+		finished.set()
+		deadline = None
+
+	if chromosome == None or len(chromosome.getGenes()) == 0: return [], None
+	moves = []
+	for gene in chromosome.getGenes():
+		moves.append(from_coordinates(gene.getMove().moveCoordinates[0], gene.getMove().moveCoordinates[1]))
+	return moves, chromosome.getGenes()[-1].getMove().score
+
+######################## PONDERING ########################
+
+# will make the search running on another thread stop at its next node (it raises SearchTimeout), and the
+# tasks it gave the worker pool too
+def stop_search():
+	global search_stopped, deadline
+	search_stopped = True
+	deadline = 0 # every search checks the deadline on its nodes already
+	if search_cancel != None: search_cancel.value = search_count
+
+''' after its move a player guesses the reply of its opponent and searches the position after it on
+    the ponder process while the opponent thinks, if the opponent plays that reply the player takes
+    the move found there (waiting for the search to finish if it has to) instead of searching again '''
+
+# will guess the reply of the opponent of player (to move on the main board) with a short alpha-beta search
+# (the transposition table often has it from the search that just ended) and start pondering the position after it
+def start_ponder(player):
+	global search_depth, best_move, ponder_count
+	opponent = turn
+	pending = ponders.get(opponent)
+	if pending != None and pending[0] != hash_key(board, opponent): stop_ponder() # player did not play the expected reply
+
+	moves = avail_moves(board, opponent)
+	if len(moves) == 0: return # the game is over
+	reply = moves[0] # forced (jumps are mandatory)
+	if len(moves) > 1:
+		search_depth, best_move = reply_depth, ()
+		alpha_beta(opponent, board, 0, -10000, +10000)
+		if len(best_move) > 0: reply = from_coordinates(best_move[0], best_move[1])
+	position = board.copy()
+	make_move(position, reply)
+
+	task = (position.black, position.white, position.kings, player, ponder_count)
+	ponders[player.color] = (hash_key(position, player.color), ponder_count, ponder_process().apply_async(ponder_position, (task,)))
+	ponder_count += 1
+
+# will return (move as squares, score, generations) the ponder process found for player on the main board,
+# waiting for it to finish, or None if it pondered another position
+def pondered(player):
+	key, number, result = ponders.pop(player.color)
+	if key != hash_key(board, player.color):
+		stop_ponder() # its result is of no use
+		return None
+	return wait_result(result)
+
+# will stop the ponders that are running or waiting (the running one at its next node)
+def stop_ponder():
+	ponders.clear()
+	if ponder_cancel != None: ponder_cancel.value = ponder_count
+
+# will return the ponder process (started once and reused, it is forked, so start it before any threads)
+def ponder_process():
+	global ponder_pool, ponder_cancel
+	if ponder_pool == None:
+		ponder_cancel = multiprocessing.Value('i', 0)
+		ponder_pool = multiprocessing.Pool(1, init_ponder_worker, (ponder_cancel, worker_settings()))
+	return ponder_pool
+
+# runs in the ponder process when it starts
+def init_ponder_worker(cancel, settings):
+	global ponder_cancel, show_stats
+	ponder_cancel = cancel
+	show_stats = False # the searches of the window process print theirs
+	load_worker_settings(settings)
+	leave_process_group()
+
+# will search a position on the ponder process, task = (black, white, kings, player to move, number of the ponder),
+# returns (best move as squares, score, generations) or None if player has no move or the ponder was stopped
+def ponder_position(task):
+	global board, turn, best_move, search_stopped, deadline
+	black_mask, white_mask, kings, player, number = task
+	if ponder_cancel.value > number: return None # stopped before it started
+	player.processes = 1 # the ponder process cannot start processes of its own
+	board, turn, best_move = Position(black_mask, white_mask, kings), player.color, ()
+	search_stopped, deadline = False, None
+	finished = watch_cancel(ponder_cancel, number)
+	try:
+		score = think(player)
+	except SearchTimeout: # stopped
+		return None
+	finally:
+		finished.set()
+	if len(best_move) == 0 or score == None: return None
+	return from_coordinates(best_move[0], best_move[1]), score, generations
+
+# will start a thread in a worker process that stops the search of task number (at its next node) once cancel
+# (a multiprocessing.Value) goes past number, returns the threading.Event to set when the search is finished
+def watch_cancel(cancel, number):
+	finished = threading.Event()
+	watcher = threading.Thread(target=watch_task, args=(cancel, number, finished))
+	watcher.daemon = True
+	watcher.start()
+	return finished
+
+# runs on the thread started by watch_cancel
+def watch_task(cancel, number, finished):
+	global search_stopped, deadline
+	while not finished.wait(0.02):
+		if cancel.value > number:
+			search_stopped, deadline = True, 0 # like stop_search, but only in this process
+			return
+
+# will stop the ponder process and the worker pool (what they search first), call it before exit() or
+# multiprocessing waits for them at exit
+def shutdown():
+	global ponder_pool, search_pool
+	stop_ponder()
+	if search_cancel != None: search_cancel.value = search_count
+	for pool in (ponder_pool, search_pool):
+		if pool != None:
+			pool.terminate()
+			pool.join()
+	ponder_pool, search_pool = None, None
+
+######################## GAME FUNCTIONS ########################
+
+# print the statistics of the games so far
+def print_statistics(statistics):
+	print("Round: ",statistics['round']) 
+	print("Genetic Time: ",statistics['geneticTime']) 
+	print("Minimax Time: ",statistics['minimaxTime']) 
+	print("Winner is: ",statistics['winner'])  
+	print("Minimax Wins: ",statistics['minimaxWins'])  
+	print("Genetic Wins: ",statistics['geneticWins'])  
+	print("Draws: ",statistics['draws'])  
+	if statistics.get('geneticMoves', 0) > 0:
+		print("Generations per Move: ",statistics['geneticGenerations'] / float(statistics['geneticMoves'])) 
+	if show_latency:
+		for strategy in sorted(statistics['latencies']):
+			times = statistics['latencies'][strategy]
+			if len(times) == 0: continue
+			print("Latency %s: p50 %.4f s, p95 %.4f s, p99 %.4f s (%d moves)" % tuple([strategy] + percentiles(times) + [len(times)]))
+	print("---------------------------")
+
+# running the genetic algorithm 
+def runGenetic(strategy, ply_depth):
+	if turn != 'black' and white.type != 'cpu':
+		white.strategy = strategy 
+		white.ply_depth = ply_depth 
+		return genetic_cpu(white) 
+	elif turn != 'black' and black.type != 'cpu':
+		black.strategy = strategy 
+		black.ply_depth = ply_depth 
+		return genetic_cpu(black) 
+
+# will return the winner of the game on the main board ('black', 'white' or 'draw'), None if it goes on
+def game_over():
+	end = end_game(board)
+	if end[1] == 0: return 'black'
+	elif end[0] == 0: return 'white'
+	elif move_limit[1] >= move_limit[0]: return 'draw' # we breached the threshold for number of moves
+	return None
+
+######################## HEADLESS ########################
+
+# will play one game on the main board between the black and white players (no gui) and return the winner
+def play_game():
+	global board, turn
+	board = init_board()
+	turn = 'white'
+	winner = None
+	while winner == None:
+		if turn != 'black': player = white
+		else: player = black
+		if player.type != 'cpu': winner = genetic_cpu(player)
+		else: winner = cpu_play(player)
+		if winner == None: winner = game_over()
+	return winner
+
+# will play a number of games between two players without the gui and return the statistics show_winner prints
+# (as in the experiment, black counts as minimax and white as genetic)
+def play_match(black_player, white_player, games):
+	global black, white
+	black, white = black_player, white_player
+	records = []
+	for i in range(games):
+		records.append(game_record(play_game()))
+		if results_recorder != None: results_recorder.record(records[-1])
+	return summarize(records)
+
+# will return the record of the game that just ended on the main board (the fields of results.FIELDS)
+def game_record(winner, ply=None, seed=None):
+	return {'ply': ply, 'seed': seed, 'black': black.type, 'white': white.type, 'black_strategy': black.strategy,
+		'white_strategy': white.strategy, 'black_ply': black.ply_depth, 'white_ply': white.ply_depth, 'winner': winner,
+		'moves': move_limit[1], 'black_time': sum(move_times['black']), 'white_time': sum(move_times['white']),
+		'black_latencies': list(move_times['black']), 'white_latencies': list(move_times['white']), 'generations': game_generations}
+
+# will return the statistics show_winner prints for the records of some games (as in the experiment, black
+# counts as minimax and white as genetic), with the seconds of every move for each strategy
+def summarize(records):
+	statistics = {'round': len(records), 'geneticTime': 0, 'minimaxTime': 0, 'winner': None, 'minimaxWins': 0, 'geneticWins': 0,
+		'draws': 0, 'geneticMoves': 0, 'geneticGenerations': 0, 'latencies': {}}
+	for game in records:
+		statistics['winner'] = game['winner']
+		if game['winner'] == 'black': statistics['minimaxWins'] += 1
+		elif game['winner'] == 'white': statistics['geneticWins'] += 1
+		else: statistics['draws'] += 1
+		statistics['minimaxTime'] += game['black_time']
+		statistics['geneticTime'] += game['white_time']
+		statistics['geneticMoves'] += len(game['white_latencies'])
+		statistics['geneticGenerations'] += game['generations']
+		statistics['latencies'].setdefault(game['black_strategy'], []).extend(game['black_latencies'])
+		statistics['latencies'].setdefault(game['white_strategy'], []).extend(game['white_latencies'])
+	if len(records) > 0: # times per game
+		statistics['minimaxTime'] = statistics['minimaxTime'] / float(len(records))
+		statistics['geneticTime'] = statistics['geneticTime'] / float(len(records))
+	return statistics
+
+# will play one game of a tournament, game = (ply, black settings, white settings, seed, worker settings) where
+# the black and white settings are the arguments of init_player, returns the record of the game
+def play_tournament_game(game):
+	global black, white
+	ply, black_settings, white_settings, seed, settings = game
+	load_worker_settings(settings)
+	random.seed(seed) # every game has its own random numbers...
+	transposition.clear() # ...and starts with nothing remembered from other games
+	genetic_lines.clear()
+	black, white = init_player(*black_settings), init_player(*white_settings)
+	return game_record(play_game(), ply, seed)
+
+# the experiment without the gui: rounds games of genetic (white) against minimax (black) for every ply,
+# spread over a pool of worker processes, returns the statistics of every ply (made from the records of
+# the games, which are also written to results_recorder)
+def run_tournament(rounds, plies, processes=1, seed=0):
+	games, settings = [], worker_settings()
+	for ply in plies:
+		for i in range(rounds):
+			black_settings = ('cpu', 'black', 'minimax', ply, move_time, game_clock)
+			white_settings = ('genetic', 'white', 'genetic', ply, move_time, game_clock, 1, genetic_config)
+			games.append((ply, black_settings, white_settings, seed*1000003 + ply*10007 + i, settings))
+
+	records = {}
+	for ply in plies: records[ply] = []
+	if processes > 1:
+		pool = multiprocessing.Pool(processes)
+		results = pool.imap_unordered(play_tournament_game, games) # games finish in any order
+	else:
+		pool = None
+		results = map(play_tournament_game, games)
+	try:
+		for record in results:
+			records[record['ply']].append(record)
+			if results_recorder != None: results_recorder.record(record)
+	finally:
+		if pool != None:
+			pool.close()
+			pool.join()
+		if results_recorder != None: results_recorder.flush()
+	statistics = {}
+	for ply in plies: statistics[ply] = summarize(records[ply])
+	return statistics
+
+######################## OPENING BOOK ########################
+
+# will search every position of the first plies of a game depth plies deep (with alpha-beta, on a pool
+# of worker processes) and write their best moves to the opening book filename, returns the number of positions
+def build_book(filename, plies=book_plies, depth=book_depth, processes=1):
+	tasks, keys, settings = [], set(), worker_settings()
+	frontier = [(init_board(), 'white')]
+	for ply in range(plies):
+		next_frontier = []
+		for position, player in frontier:
+			key = hash_key(position, player)
+			if key in keys: continue # reached by another order of moves
+			keys.add(key)
+			tasks.append((position.black, position.white, position.kings, player, depth, settings))
+			if player == 'black': opponent = 'white'
+			else: opponent = 'black'
+			for move in avail_moves(position, player):
+				child = position.copy()
+				make_move(child, move)
+				next_frontier.append((child, opponent))
+		frontier = next_frontier
+
+	if processes > 1:
+		pool = multiprocessing.Pool(processes)
+		results = pool.map(search_book_position, tasks, 1)
+		pool.close()
+		pool.join()
+	else: results = map(search_book_position, tasks)
+	entries = {}
+	for key, move, score in results:
+		if move != None: entries[key] = (move, score)
+	write_book(filename, entries)
+	return len(entries)
+
+# will search one position of the opening book, task = (black, white, kings, player, depth, worker settings),
+# returns (key, best move or None, score)
+def search_book_position(task):
+	global board, turn, best_move
+	black_mask, white_mask, kings, player, depth, settings = task
+	load_worker_settings(settings)
+	transposition.clear() # the same move whatever was searched before
+	board, turn, best_move = Position(black_mask, white_mask, kings), player, ()
+	score = think(Player('cpu', player, 'alpha-beta', depth))
+	if len(best_move) == 0: return hash_key(board, player), None, score
+	return hash_key(board, player), from_coordinates(best_move[0], best_move[1]), score
+
+######################## ANALYSIS ########################
+
+# will search the positions of lines (one to_fen text per line, empty lines and lines starting with # are
+# skipped) with strategy to depth plies or for move_time seconds, on a pool of worker processes, and yield
+# the result of every position as soon as it is found (in the order the positions finish, see 'index')
+def analyze_positions(lines, strategy='alpha-beta', depth=6, move_time=None, processes=1, seed=0):
+	settings = worker_settings()
+	tasks = ((index, line.strip(), strategy, depth, move_time, genetic_config, seed + index, settings)
+		for index, line in enumerate(lines) if line.strip() != '' and not line.startswith('#'))
+	if processes > 1:
+		pool = multiprocessing.Pool(processes)
+		results = pool.imap_unordered(analyze_position, tasks) # the pool reads all the positions at once, results come as they finish
+	else:
+		pool = None
+		results = map(analyze_position, tasks)
+	try:
+		for result in results: yield result
+	finally:
+		if pool != None:
+			pool.terminate() # the caller may stop before the last position
+			pool.join()
+
+# will search one position, task = (index, text, strategy, depth, move_time, genetic settings, seed, worker
+# settings), returns {'index', 'position', 'player', 'move', 'score', 'stats'} (or {'index', 'position', 'error'}
+# for a bad position)
+def analyze_position(task):
+	global board, turn, best_move
+	index, text, strategy, depth, move_time, genetic, seed, settings = task
+	load_worker_settings(settings)
+	try:
+		position, player = from_fen(text)
+	except ValueError as error:
+		return {'index': index, 'position': text, 'error': str(error)}
+	if player == 'black': opponent_count = position.white_count
+	else: opponent_count = position.black_count
+	if opponent_count == 0 or len(avail_moves(position, player)) == 0: # the game is over, won or lost for player
+		return {'index': index, 'position': to_fen(position, player), 'player': player, 'move': None,
+			'score': 10000 if opponent_count == 0 else -10000, 'stats': None}
+	random.seed(seed) # the genetic player finds the same move whatever was searched before...
+	transposition.clear() # ...and so do the others
+	genetic_lines.clear()
+	board, turn, best_move = position, player, ()
+	score = think(init_player('cpu', player, strategy, depth, move_time, None, 1, genetic))
+	move = None
+	if len(best_move) > 0: move = move_text(from_coordinates(best_move[0], best_move[1]))
+	return {'index': index, 'position': to_fen(position, player), 'player': player, 'move': move, 'score': score,
+		'stats': search_stats.as_dict()}
+
+######################## BENCHMARK ########################
+
+BENCHMARK_POSITIONS = [ # (name, black, white, kings, player to move)
+	('start', 0x00000FFF, 0xFFF00000, 0x00000000, 'white'),
+	('midgame', 0x0004607D, 0xFD101000, 0x00000000, 'white'),
+	('endgame', 0x90080000, 0x00C00100, 0x90000100, 'white')]
+BENCHMARK_DEPTHS = {'minimax': 5, 'negamax': 10, 'negascout': 10, 'alpha-beta': 10, 'genetic': 10} # deepest search of every strategy
+
+# will return the seconds a new interpreter takes to import the engine and everything it imports (python -X importtime)
+def import_seconds():
+	process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import engine'], cwd=os.path.dirname(os.path.abspath(__file__)),
+		stderr=subprocess.PIPE, universal_newlines=True)
+	for line in process.stderr.splitlines():
+		fields = line.split('|')
+		if len(fields) == 3 and fields[2].strip() == 'engine': return int(fields[1]) / 1e6 # microseconds
+	return None
+
+# will time the move generator (perft) and every strategy searching the benchmark positions, the genetic
+# player with the random numbers seeded, returns the results (as saved in the json file)
+def run_benchmark(perft_depth=7, depths=BENCHMARK_DEPTHS, seed=0):
+	global board, turn, search_depth, nodes, best_move
+	results = {'python': platform.python_version(), 'seed': seed, 'import_seconds': import_seconds(), 'perft': {}, 'search': {}}
+	for name, black_mask, white_mask, kings, player in BENCHMARK_POSITIONS:
+		results['perft'][name] = []
+		for depth in range(1, perft_depth+1):
+			startTime = time.time()
+			count = perft(Position(black_mask, white_mask, kings), player, depth)
+			seconds = time.time() - startTime
+			results['perft'][name].append({'depth': depth, 'nodes': count, 'seconds': seconds, 'nodes_per_second': count / max(seconds, 1e-9)})
+
+		results['search'][name] = {}
+		for strategy in ('minimax', 'negamax', 'negascout', 'alpha-beta', 'genetic'):
+			''' deepen like think() does: the transposition table and move ordering are kept from one depth to the next '''
+			transposition.clear()
+			clear_ordering()
+			random.seed(seed)
+			board, turn = Position(black_mask, white_mask, kings), player
+			cpu = Player('cpu', player, strategy, depths[strategy])
+			results['search'][name][strategy] = []
+			startTime = time.time()
+			for depth in range(1, depths[strategy]+1):
+				search_depth, nodes, best_move = depth, 0, ()
+				transposition.new_search()
+				genetic_lines.clear() # the genetic player starts every depth from fresh rollouts
+				depthTime = time.time()
+				score = search(cpu, board)
+				seconds = time.time() - depthTime
+				results['search'][name][strategy].append({'depth': depth, 'nodes': nodes, 'seconds': seconds,
+					'nodes_per_second': nodes / max(seconds, 1e-9), 'time_to_depth': time.time() - startTime,
+					'score': score, 'move': [list(square) for square in best_move]})
+	count, differ = check_parallel()
+	results['parallel'] = {'searches': count, 'differ': [[name, strategy, depth, list(serial), list(parallel)] for name, strategy, depth, serial, parallel in differ]}
+	count, failed = check_genetic(seed=seed)
+	results['genetic_games'] = {'games': count, 'failed': [list(game) for game in failed]}
+	return results
+
+# will search every benchmark position with every strategy but the genetic one at depths 1 to depth, once on
+# one process and once on processes workers from the same transposition table and move ordering (empty, then
+# left by alpha-beta searches of the position deepened to depth), returns the number of searches compared and the ones whose
+# move or score differ as (position, strategy, depth, serial (move, score), parallel (move, score))
+def check_parallel(processes=2, depth=5):
+	global board, turn, search_depth, nodes, best_move
+	count, differ = 0, []
+	for name, black_mask, white_mask, kings, player in BENCHMARK_POSITIONS:
+		for strategy in ('minimax', 'negamax', 'negascout', 'alpha-beta'):
+			for d in range(1, depth+1):
+				for warm in (False, True):
+					found = []
+					for cpu in (Player('cpu', player, strategy, d), Player('cpu', player, strategy, d, processes=processes)):
+						transposition.clear()
+						clear_ordering()
+						shutdown() # the workers keep their transposition tables, start them empty
+						board, turn = Position(black_mask, white_mask, kings), player
+						if warm:
+							for search_depth in range(1, depth+1):
+								transposition.new_search()
+								alpha_beta(player, board, 0, -10000, +10000)
+						search_depth, nodes, best_move = d, 0, ()
+						transposition.new_search()
+						score = search(cpu, board)
+						found.append((best_move, score))
+					count += 1
+					if found[0] != found[1]: differ.append((name, strategy, d, found[0], found[1]))
+	return count, differ
+
+# will play games seeded seed, seed+1... of the genetic player (white) with population chromosomes for every
+# population against alpha-beta (black) at ply, returns the number of games played and the ones that
+# raised an exception as (population, seed, exception text)
+def check_genetic(games=20, populations=(16, 32), ply=4, seed=0):
+	count, failed = 0, []
+	for population in populations:
+		config = GeneticConfig(population)
+		for i in range(games):
+			black_settings = ('cpu', 'black', 'alpha-beta', ply)
+			white_settings = ('genetic', 'white', 'genetic', ply, None, None, 1, config)
+			count += 1
+			try:
+				play_tournament_game((ply, black_settings, white_settings, seed + i, worker_settings()))
+			except Exception as e:
+				failed.append((population, seed + i, '%s: %s' % (type(e).__name__, e)))
+	return count, failed
+
+# will print the results of run_benchmark, next to the ones of baseline if given (the node counts
+# should be the same, the speed is the share of the baseline nodes per second)
+def print_benchmark(results, baseline=None):
+	if results.get('import_seconds') != None:
+		line = "import engine %.3f s" % results['import_seconds']
+		if baseline != None and baseline.get('import_seconds') != None: line += "  (baseline %.3f s)" % baseline['import_seconds']
+		print(line)
+	if results.get('parallel') != None:
+		print("parallel search: %d of %d searches differ from the serial search" % (len(results['parallel']['differ']), results['parallel']['searches']))
+		for name, strategy, depth, serial, parallel in results['parallel']['differ']:
+			print("  %s %s depth %d: serial %s, parallel %s" % (name, strategy, depth, serial, parallel))
+	if results.get('genetic_games') != None:
+		print("genetic games: %d of %d games failed" % (len(results['genetic_games']['failed']), results['genetic_games']['games']))
+		for population, seed, error in results['genetic_games']['failed']:
+			print("  population %d seed %d: %s" % (population, seed, error))
+	rows = []
+	for name in results['perft']:
+		for row in results['perft'][name]: rows.append(('perft', name, row))
+	for name in results['search']:
+		for strategy in results['search'][name]:
+			for row in results['search'][name][strategy]: rows.append((strategy, name, row))
+	for test, name, row in rows:
+		line = "%-10s %-8s depth %d: %9d nodes %8.3f s %9.0f nodes/s" % (test, name, row['depth'], row['nodes'], row['seconds'], row['nodes_per_second'])
+		old = None
+		if baseline != None:
+			if test == 'perft': old = baseline['perft'].get(name, [])
+			else: old = baseline['search'].get(name, {}).get(test, [])
+			old = dict((r['depth'], r) for r in old).get(row['depth'])
+		if old != None:
+			line += "  x%.2f" % (row['nodes_per_second'] / max(old['nodes_per_second'], 1e-9))
+			if old['nodes'] != row['nodes']: line += "  (baseline %d nodes)" % old['nodes']
+		print(line)
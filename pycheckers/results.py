@@ -0,0 +1,107 @@
+'''
+results of the experiment: one record per game, buffered and written in batches to a jsonl, csv or sqlite file
+every batch is written under a lock on the file, so processes that record to the same file do not mix their lines
+'''
+
+import csv
+import io
+import json
+import os
+import sqlite3
+try:
+	import fcntl
+except ImportError: # no file locks (windows), only one process should write to a jsonl or csv file
+	fcntl = None
+
+######################## VARIABLES ########################
+
+FIELDS = ('ply', 'seed', 'black', 'white', 'black_strategy', 'white_strategy', 'black_ply', 'white_ply', 'winner', 'moves',
+	'black_time', 'white_time', 'black_latencies', 'white_latencies', 'generations') # fields of a record, in this order
+LISTS = ('black_latencies', 'white_latencies') # fields kept as json in csv and sqlite
+NUMBERS = {'ply': int, 'seed': int, 'black_ply': int, 'white_ply': int, 'moves': int, 'black_time': float, 'white_time': float,
+	'generations': int} # fields read back from csv as numbers
+FORMATS = {'.jsonl': 'jsonl', '.csv': 'csv', '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite'} # format of every extension
+
+######################## CLASSES ########################
+
+# class representing a results file that records are written to, batch records at a time
+class ResultsRecorder(object):
+	def __init__(self, filename, format=None, batch=20):
+		if format == None: format = FORMATS.get(os.path.splitext(filename)[1].lower())
+		if format not in ('jsonl', 'csv', 'sqlite'): raise ValueError('unknown results format: ' + str(format))
+		self.filename = filename
+		self.format = format
+		self.batch = batch # records kept in memory before they are written
+		self.buffer = []
+		self.written = 0
+
+	# will add the record of a game (fields missing from it are None)
+	def record(self, game):
+		self.buffer.append(dict((field, game.get(field)) for field in FIELDS))
+		if len(self.buffer) >= self.batch: self.flush()
+
+	# will write the records kept in memory
+	def flush(self):
+		if len(self.buffer) == 0: return
+		if self.format == 'sqlite': self.write_sqlite()
+		else: self.write_file()
+		self.written += len(self.buffer)
+		self.buffer = []
+
+	def close(self):
+		self.flush()
+
+	def write_file(self):
+		text = io.StringIO()
+		if self.format == 'csv':
+			writer = csv.writer(text, lineterminator='\n')
+			for game in self.buffer: writer.writerow([json.dumps(game[field]) if field in LISTS else game[field] for field in FIELDS])
+		else:
+			for game in self.buffer: text.write(json.dumps(game) + '\n')
+		with open(self.filename, 'a', newline='') as f:
+			if fcntl != None: fcntl.flock(f, fcntl.LOCK_EX)
+			try:
+				f.seek(0, os.SEEK_END) # another process may have written since the file was opened
+				if self.format == 'csv' and f.tell() == 0: f.write(','.join(FIELDS) + '\n')
+				f.write(text.getvalue())
+				f.flush()
+			finally:
+				if fcntl != None: fcntl.flock(f, fcntl.LOCK_UN)
+
+	def write_sqlite(self):
+		connection = sqlite3.connect(self.filename, timeout=60) # sqlite locks the database itself
+		try:
+			with connection: # one transaction for the batch
+				connection.execute('CREATE TABLE IF NOT EXISTS games (' + ', '.join(FIELDS) + ')')
+				connection.executemany('INSERT INTO games VALUES (' + ', '.join('?'*len(FIELDS)) + ')',
+					[[json.dumps(game[field]) if field in LISTS else game[field] for field in FIELDS] for game in self.buffer])
+		finally:
+			connection.close()
+
+######################## FUNCTIONS ########################
+
+# will read the records of a results file back (in the order they were written)
+def load_results(filename, format=None):
+	if format == None: format = FORMATS.get(os.path.splitext(filename)[1].lower())
+	if format == 'sqlite':
+		connection = sqlite3.connect(filename)
+		try:
+			rows = connection.execute('SELECT ' + ', '.join(FIELDS) + ' FROM games ORDER BY rowid').fetchall()
+		finally:
+			connection.close()
+		games = [dict(zip(FIELDS, row)) for row in rows]
+	elif format == 'csv':
+		with open(filename, newline='') as f:
+			games = list(csv.DictReader(f))
+		for game in games:
+			for field in FIELDS:
+				if game[field] == '': game[field] = None
+				elif field in NUMBERS: game[field] = NUMBERS[field](game[field])
+	elif format == 'jsonl':
+		with open(filename) as f:
+			return [json.loads(line) for line in f if line.strip() != '']
+	else: raise ValueError('unknown results format: ' + str(format))
+	for game in games:
+		for field in LISTS:
+			if game[field] != None: game[field] = json.loads(game[field])
+	return games
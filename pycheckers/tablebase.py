@@ -0,0 +1,211 @@
+'''
+endgame tablebase: won, lost or drawn (and the plies to the end) for every position with few pieces left,
+made by retrograde analysis
+positions are kept with black to move (a position with white to move is turned around and its colors are
+swapped first), one table per material (black men, black kings, white men, white kings) with one byte per
+position, and the file is memory-mapped so processes that open the same tablebase share one copy in memory
+'''
+
+import itertools
+import mmap
+import struct
+from array import array
+from bitboard import Position, avail_moves, make_move, unmake_move, BLACK_KING_ROW, WHITE_KING_ROW
+
+######################## VARIABLES ########################
+
+MAGIC = b'PCT1' # first bytes of a tablebase file
+HEADER = struct.Struct('<4sII') # magic, most pieces, number of tables
+TABLE = struct.Struct('<4BII') # material, offset of the table in the file, number of positions
+WIN = 5000 # score of a won position (less the plies to the win), a lost one scores -WIN (plus the plies)
+LONGEST = 127 # most plies to the end a byte keeps
+
+''' a byte is 0 for a draw, d for a win in d plies and -d-1 for a loss in d plies '''
+
+BINOMIAL = [[0]*33 for n in range(33)] # BINOMIAL[n][k] = n choose k
+for n in range(33):
+	BINOMIAL[n][0] = 1
+	for k in range(1, n+1): BINOMIAL[n][k] = BINOMIAL[n-1][k-1] + BINOMIAL[n-1][k]
+
+REVERSED = [int('{:08b}'.format(b)[::-1], 2) for b in range(256)] # every byte with its bits the other way round
+
+######################## FUNCTIONS ########################
+
+# will return mask turned around (square -> 31 - square), which moves black's side of the board to white's
+def turn_around(mask):
+	return REVERSED[mask & 255] << 24 | REVERSED[mask >> 8 & 255] << 16 | REVERSED[mask >> 16 & 255] << 8 | REVERSED[mask >> 24]
+
+# will return the rank of the squares of mask among all masks with as many squares (combinatorial number system)
+def rank(mask):
+	result, i = 0, 1
+	while mask:
+		bit = mask & -mask
+		mask ^= bit
+		result += BINOMIAL[bit.bit_length()-1][i]
+		i += 1
+	return result
+
+# will return the masks (black men, black kings, white men, white kings) of the position seen with black to move
+def normalize(position, player):
+	black, white, kings = position.black, position.white, position.kings
+	if player == 'black': return black & ~kings, black & kings, white & ~kings, white & kings
+	return turn_around(white & ~kings), turn_around(white & kings), turn_around(black & ~kings), turn_around(black & kings)
+
+# will return (material, index in the table of the material) for the masks made by normalize
+def locate(masks):
+	material = tuple(bin(mask).count('1') for mask in masks)
+	index = 0
+	for mask, count in zip(masks, material): index = index*BINOMIAL[32][count] + rank(mask)
+	return material, index
+
+# number of positions in the table of material
+def table_size(material):
+	size = 1
+	for count in material: size *= BINOMIAL[32][count]
+	return size
+
+# will return the score of the player to move for a byte of a table
+def score(value):
+	if value > 0: return WIN - value
+	if value < 0: return -WIN - value - 1
+	return 0
+
+######################## CLASSES ########################
+
+# class representing a tablebase file opened for reading
+class Tablebase(object):
+	def __init__(self, filename):
+		self.filename = filename
+		self.file = open(filename, 'rb')
+		self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		if len(self.data) < HEADER.size: raise ValueError(filename + ' is not a tablebase')
+		magic, self.pieces, count = HEADER.unpack_from(self.data, 0)
+		if magic != MAGIC: raise ValueError(filename + ' is not a tablebase')
+		self.tables = {} # offset of the table for every material
+		for i in range(count):
+			bm, bk, wm, wk, offset, size = TABLE.unpack_from(self.data, HEADER.size + i*TABLE.size)
+			if offset + size > len(self.data): raise ValueError(filename + ' is cut short')
+			self.tables[(bm, bk, wm, wk)] = offset
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self.tables)
+
+	# will return the exact score of position for player (to move) or None if it is not in the tablebase
+	def probe(self, position, player):
+		if position.black_count + position.white_count > self.pieces: return None
+		if position.black_count == 0 or position.white_count == 0: return None # the game is over
+		material, index = locate(normalize(position, player))
+		offset = self.tables.get(material)
+		if offset == None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		value = self.data[offset + index]
+		if value > 127: value -= 256
+		return score(value)
+
+	def close(self):
+		self.data.close()
+		self.file.close()
+
+######################## GENERATION ########################
+
+# will solve every position with up to pieces pieces (both players having at least one) and write them
+# to the tablebase filename, returns the size of the tables (one byte per position)
+def build_tablebase(filename, pieces=3):
+	materials = [m for m in itertools.product(range(pieces+1), repeat=4) if sum(m) <= pieces and m[0]+m[1] > 0 and m[2]+m[3] > 0]
+	''' a move without capture or crowning leads to the swapped material (white to move is turned around), a capture
+	    to fewer pieces and a crowning to fewer men, so solve each material with its swapped one, fewest pieces and men first '''
+	materials.sort(key=lambda m: (sum(m), m[0]+m[2], min(m, m[2:] + m[:2])))
+	tables = {}
+	for material in materials:
+		if material in tables: continue
+		group = [material]
+		if material[2:] + material[:2] != material: group.append(material[2:] + material[:2])
+		tables.update(solve(group, tables))
+
+	with open(filename, 'wb') as f:
+		f.write(HEADER.pack(MAGIC, pieces, len(materials)))
+		offset = HEADER.size + len(materials)*TABLE.size
+		for material in materials:
+			f.write(TABLE.pack(*(material + (offset, len(tables[material])))))
+			offset += len(tables[material])
+		for material in materials: f.write(tables[material].tobytes())
+	return sum(len(table) for table in tables.values())
+
+# will yield (black, white, kings) for every position of material with black to move
+def positions(material):
+	bm, bk, wm, wk = material
+	black_men = [sq for sq in range(32) if not BLACK_KING_ROW & (1 << sq)] # a man there would be a king
+	white_men = [sq for sq in range(32) if not WHITE_KING_ROW & (1 << sq)]
+	for a in itertools.combinations(black_men, bm):
+		a = sum(1 << sq for sq in a)
+		for b in itertools.combinations(range(32), bk):
+			b = sum(1 << sq for sq in b)
+			if a & b: continue
+			for c in itertools.combinations(white_men, wm):
+				c = sum(1 << sq for sq in c)
+				if (a | b) & c: continue
+				for d in itertools.combinations(range(32), wk):
+					d = sum(1 << sq for sq in d)
+					if (a | b | c) & d: continue
+					yield a | b, c | d, b | d
+
+# will solve the materials of group (whose moves lead to each other or to the solved tables) by retrograde
+# analysis, returns {material: table}
+def solve(group, tables):
+	offsets, size = {}, 0 # positions of the group are numbered one material after the other
+	for material in group:
+		offsets[material] = size
+		size += table_size(material)
+	remaining = array('i', bytes(4*size)) # children not (yet) known to be won for the opponent
+	longest = array('i', bytes(4*size)) # plies of the longest of those
+	parents = {} # positions of the group that move to each position of the group
+	buckets = [[] for d in range(LONGEST+2)] # (position, won) for every number of plies to the end
+
+	for material in group:
+		for black, white, kings in positions(material):
+			position = Position(black, white, kings)
+			node = offsets[material] + locate(normalize(position, 'black'))[1]
+			win = None
+			for move in avail_moves(position, 'black'):
+				undo = make_move(position, move)
+				if position.white_count == 0: win = 1 # took the last piece
+				else:
+					child, index = locate(normalize(position, 'white'))
+					if child in offsets:
+						parents.setdefault(offsets[child] + index, []).append(node)
+						remaining[node] += 1
+					else:
+						value = tables[child][index]
+						if value < 0 and (win == None or -value < win): win = -value # lost in -value-1 plies for the opponent
+						elif value > 0: longest[node] = max(longest[node], value+1)
+						elif value == 0: remaining[node] += 1 # a draw is never won for the opponent
+				unmake_move(position, undo)
+			if win != None:
+				buckets[win].append((node, True))
+				remaining[node] += 1 # never lost, whatever its children in the group turn out to be
+			elif remaining[node] == 0: buckets[min(longest[node], LONGEST+1)].append((node, False)) # no moves left is a loss at once
+
+	''' the positions are solved in the order of plies to the end, so every win is the fastest and
+	    every loss the slowest: a lost position makes its parents won one ply later, and a won
+	    position makes its parents lost once all their other children are won too '''
+	values = array('b', bytes(size))
+	solved = bytearray(size)
+	for d in range(LONGEST+1):
+		for node, won in buckets[d]:
+			if solved[node]: continue
+			solved[node] = 1
+			values[node] = d if won else -d-1
+			for parent in parents.get(node, ()):
+				if solved[parent]: continue
+				if not won: buckets[d+1].append((parent, True))
+				else:
+					remaining[parent] -= 1
+					longest[parent] = max(longest[parent], d+1)
+					if remaining[parent] == 0: buckets[min(longest[parent], LONGEST+1)].append((parent, False))
+	if any(not solved[node] for node, won in buckets[LONGEST+1]): raise ValueError('positions more than %d plies from the end' % LONGEST)
+
+	return dict((material, values[offsets[material]:offsets[material]+table_size(material)]) for material in group)
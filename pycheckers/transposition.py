@@ -0,0 +1,55 @@
+'''
+fixed-size transposition table for the alpha-beta family of searches
+scores are stored from the point of view of the player to move in the position
+'''
+
+######################## VARIABLES ########################
+
+EXACT, LOWER, UPPER = 0, 1, 2 # bound types (score is exact, at least score, at most score)
+FLIP = (EXACT, UPPER, LOWER) # bound type seen from the other player
+
+######################## CLASSES ########################
+
+# class representing transposition table
+class TranspositionTable(object):
+	def __init__(self, size):
+		self.resize(size)
+
+	# will set the number of entries (and empty the table)
+	def resize(self, size):
+		self.size = max(1, int(size))
+		self.clear()
+
+	def clear(self):
+		self.entries = [None] * self.size # (key, depth, bound, score, best move, age)
+		self.age = 0 # number of the current search
+		self.hits = 0
+		self.misses = 0
+		self.stores = 0
+
+	# called before every search so entries of old searches are replaced first
+	def new_search(self):
+		self.age += 1
+
+	# will return the entry (key, depth, bound, score, best move, age) for key or None
+	def probe(self, key):
+		entry = self.entries[key % self.size]
+		if entry != None and entry[0] == key:
+			self.hits += 1
+			return entry
+		self.misses += 1
+		return None
+
+	# will save the result of a search, replacing the entry in the slot if
+	# it is empty, it is the same position, it is from an older search or it was searched less deep
+	def store(self, key, depth, bound, score, move):
+		index = key % self.size
+		entry = self.entries[index]
+		if entry == None or entry[0] == key or entry[5] != self.age or entry[1] <= depth:
+			self.entries[index] = (key, depth, bound, score, move, self.age)
+			self.stores += 1
+
+	# share of probes that found their position
+	def hit_rate(self):
+		if self.hits + self.misses == 0: return 0.0
+		return self.hits / float(self.hits + self.misses)